@@ -0,0 +1,193 @@
+"""Throughput benchmarks for the radiodata parsing and export pipeline.
+
+Times each stage of the pipeline on one log (a synthetic one by default) and
+writes the numbers to a JSON file, so regressions in parse_txt_file and the
+writers show up run over run:
+
+    python benchmarks/run_benchmarks.py --sites 200 --output bench.json
+    python benchmarks/run_benchmarks.py --log log_MMBB.txt --output bench.json
+
+Stages: read (line splitting), section detection, every table handler, the
+NRSectorCarrier join, DataFrame build and the xlsx/csv/parquet writers, plus
+the two entry points end to end (the gen_radiodata CLI and the Streamlit ZIP),
+and the memory the parsed rows hold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radiodata import HEADERS_LTE, HEADERS_NR, generate_zip_download, parse_txt_file, write_rows
+from radiodata.cli import main as cli_main
+from radiodata.parser import ParseState, iter_lines, join_nr_carriers
+from radiodata.sections import iter_table_rows
+
+from synthlog import write_log
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def timed(func, repeat=1):
+    """Run ``func`` ``repeat`` times; return (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def traced(func):
+    """Run ``func`` under tracemalloc; return (result, MB still held by it, peak MB)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(current / (1024 * 1024), 2), round(peak / (1024 * 1024), 2)
+
+def stage(seconds, lines=None, rows=None, size=None):
+    entry = {"seconds": round(seconds, 6), "peak_rss_mb": round(peak_rss_mb(), 1)}
+    if lines is not None:
+        entry["lines"] = lines
+        entry["lines_per_s"] = round(lines / seconds) if seconds else None
+    if rows is not None:
+        entry["rows"] = rows
+        entry["rows_per_s"] = round(rows / seconds) if seconds else None
+    if size is not None:
+        entry["bytes"] = size
+    return entry
+
+def bench_parse_stages(path, repeat):
+    stages = {}
+
+    seconds, lines = timed(lambda: sum(1 for _ in iter_lines(path)), repeat)
+    stages["read"] = stage(seconds, lines=lines)
+
+    seconds, rows = timed(lambda: sum(1 for _ in iter_table_rows(iter_lines(path))), repeat)
+    stages["section_detection"] = stage(seconds, lines=lines, rows=rows)
+
+    # Per-table handler time, measured on one pass
+    state = ParseState()
+    handler_time = {}
+    handler_rows = {}
+    for handler, row in iter_table_rows(iter_lines(path)):
+        start = time.perf_counter()
+        handler(state, row)
+        name = handler.__name__
+        handler_time[name] = handler_time.get(name, 0.0) + time.perf_counter() - start
+        handler_rows[name] = handler_rows.get(name, 0) + 1
+    for name in sorted(handler_time):
+        stages[f"table.{name}"] = stage(handler_time[name], rows=handler_rows[name])
+
+    carriers = list(state.nr_carriers)
+    seconds, _ = timed(lambda: join_nr_carriers([dict(row) for row in state.data_nr], [dict(c) for c in carriers]), repeat)
+    stages["join"] = stage(seconds, rows=len(carriers))
+
+    seconds, parsed = timed(lambda: parse_txt_file(path), repeat)
+    site, function, data_lte, data_nr = parsed
+    stages["parse_total"] = stage(seconds, lines=lines, rows=len(data_lte) + len(data_nr))
+
+    # Memory the parsed rows keep alive, and the allocation peak while parsing
+    _, retained_mb, peak_mb = traced(lambda: parse_txt_file(path))
+    stages["parse_memory"] = {"retained_mb": retained_mb, "traced_peak_mb": peak_mb}
+    return stages, lines, data_lte, data_nr
+
+def bench_export_stages(data_lte, data_nr, repeat, formats):
+    stages = {}
+    rows = len(data_lte) + len(data_nr)
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        seconds, _ = timed(lambda: (data_lte.to_pandas(), data_nr.to_pandas()), repeat)
+        stages["dataframe_build"] = stage(seconds, rows=rows)
+
+    for fmt in formats:
+        def write():
+            size = 0
+            for data, headers in ((data_lte, HEADERS_LTE), (data_nr, HEADERS_NR)):
+                buffer = BytesIO()
+                write_rows(data, headers, buffer, fmt)
+                size += buffer.tell()
+            return size
+        seconds, size = timed(write, repeat)
+        stages[f"write.{fmt}"] = stage(seconds, rows=rows, size=size)
+    return stages
+
+def bench_entry_points(path, lines, repeat):
+    stages = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        seconds, _ = timed(lambda: cli_main([path, "-o", output_dir]), repeat)
+    stages["entry.cli"] = stage(seconds, lines=lines)
+
+    def app_path():
+        with open(path, "rb") as upload:
+            site, function, data_lte, data_nr = parse_txt_file(upload)
+        zip_buffer, _ = generate_zip_download(site, function, data_lte, data_nr)
+        return zip_buffer.getbuffer().nbytes
+    seconds, size = timed(app_path, repeat)
+    stages["entry.app_zip"] = stage(seconds, lines=lines, size=size)
+    return stages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the radiodata parsing and export pipeline.")
+    parser.add_argument("--log", help="benchmark this log instead of a synthetic one")
+    parser.add_argument("--sites", type=int, default=100, help="nodes in the synthetic log")
+    parser.add_argument("--lte-cells", type=int, default=9, help="LTE cells per synthetic node")
+    parser.add_argument("--nr-cells", type=int, default=3, help="NR cells per synthetic node")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best time is kept")
+    parser.add_argument("--formats", default="xlsx,csv,parquet", help="comma separated writer formats to time")
+    parser.add_argument("--output", default="bench.json", help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = args.log
+        if path is None:
+            path = os.path.join(work_dir, "synthetic.txt")
+            write_log(path, args.sites, lte_cells=args.lte_cells, nr_cells=args.nr_cells,
+                      nbiot_cells=min(3, args.lte_cells))
+
+        stages, lines, data_lte, data_nr = bench_parse_stages(path, args.repeat)
+        stages.update(bench_export_stages(data_lte, data_nr, args.repeat, args.formats.split(",")))
+        stages.update(bench_entry_points(path, lines, args.repeat))
+        log_bytes = os.path.getsize(path)
+
+    results = {
+        "log": args.log or f"synthetic:{args.sites} sites",
+        "log_bytes": log_bytes,
+        "lines": lines,
+        "lte_rows": len(data_lte),
+        "nr_rows": len(data_nr),
+        "python": platform.python_version(),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": stages,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    for name, entry in stages.items():
+        if "seconds" not in entry:
+            print(f"{name:40s} " + " ".join(f"{key}={value}" for key, value in entry.items()))
+            continue
+        throughput = entry.get("lines_per_s") or entry.get("rows_per_s") or ""
+        print(f"{name:40s} {entry['seconds']:10.4f}s {throughput:>12}")
+    print(f"peak RSS {results['peak_rss_mb']} MB -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Synthetic moshell logs for benchmarking the radiodata parser.
+
+Scales the layout of the bundled sample logs (log_MMBB.txt) up to any number of
+nodes: every node gets the hgetc tables the MOS script collects plus an sdir
+block with the FRU hardware table and the RF table, one RRU per sector.
+
+    python benchmarks/synthlog.py --sites 500 --output /tmp/cluster.txt
+    python benchmarks/synthlog.py --sites 500 --split /tmp/cluster/
+"""
+
+import argparse
+import os
+import random
+import string
+
+SECTOR_LETTERS = string.ascii_uppercase + string.digits
+STAMP = "250409-21:03:05+0700 {prompt_lower} 25.0b MSRBS_NODE_MODEL_24.Q2_661.28291.124_md5_ stopfile=/tmp/52056"
+
+def render_table(columns, rows):
+    """Render an hgetc style table with every column padded to its widest value."""
+    widths = [max(len(str(value)) for value in column) for column in zip(columns, *rows)]
+    lines = []
+    for row in [columns] + rows:
+        lines.append(";".join(str(value).ljust(width) for value, width in zip(row, widths)))
+    return lines
+
+def sector_name(index):
+    if index < len(SECTOR_LETTERS):
+        return SECTOR_LETTERS[index]
+    return SECTOR_LETTERS[index // len(SECTOR_LETTERS) - 1] + SECTOR_LETTERS[index % len(SECTOR_LETTERS)]
+
+def render_site(index, lte_cells=9, nbiot_cells=3, nr_cells=3, external_cells=7, rng=None):
+    """Return the log lines of one synthetic node.
+
+    Each of the ``lte_cells`` sectors has its own RRU; the first ``nbiot_cells``
+    sectors also carry an NB-IoT cell and the first ``nr_cells`` an NR cell.
+    """
+    rng = rng or random.Random(index)
+    node = f"WM{index:05X}"
+    prompt = f"OFFLINE_{node}_DCG_K>"
+    stamp = STAMP.format(prompt_lower=f"OFFLINE_{node}_dcg_k")
+    lte_site = f"XL{index:05d}"
+    nr_site = f"XV{index:05d}"
+    tac = str(40000 + index % 9000)
+    sectors = [sector_name(i) for i in range(lte_cells)]
+    lines = []
+
+    def command(text, table_lines):
+        lines.extend([f"{prompt} {text}", "", stamp])
+        if table_lines:
+            lines.append(".")
+            lines.extend(table_lines)
+        else:
+            lines.append("Total: 0 MOs")
+        lines.append("")
+
+    command("hgetc enodebfunction=1 enodebfunctionid$|^userlabel$",
+            render_table(["MO", "eNodeBFunctionId", "userLabel"], [["ENodeBFunction=1", "1", lte_site]]))
+
+    lte_rows = []
+    for i, sector in enumerate(sectors):
+        cell = f"{lte_site}{sector}"
+        pci = rng.randrange(504)
+        earfcndl = rng.choice(["100", "1300", "3600", "6300", "9460"])
+        lte_rows.append([f"EUtranCellFDD={cell}", str(i + 1), "10000", cell, earfcndl, str(int(earfcndl) + 18000),
+                         str(pci), str(pci // 3), str(pci % 3), str(rng.randrange(0, 838, 10)), tac, "10000"])
+    external_rows = []
+    for i in range(external_cells):
+        enb = f"2622-{rng.randrange(10000, 400000)}"
+        pci = rng.randrange(504)
+        external_rows.append([f"ENodeBFunction=1,EUtraNetwork=1,ExternalENodeBFunction={enb},ExternalEUtranCellFDD={enb}-{i}",
+                              "10000", str(pci // 3), str(pci % 3), tac, "10000"])
+    command("hgetc EUtranCellFDD ^eUtranCellFDDId$|^tac$|^cellId$|^physicalLayerCellId$|^physicalLayerCellIdGroup$"
+            "|^physicalLayerSubCellId$|^earfcnul$|^earfcndl$|^ulChannelBandwidth$|^dlChannelBandwidth$|^rachRootSequence$",
+            render_table(["MO", "cellId", "dlChannelBandwidth", "eUtranCellFDDId", "earfcndl", "earfcnul",
+                          "physicalLayerCellId", "physicalLayerCellIdGroup", "physicalLayerSubCellId",
+                          "rachRootSequence", "tac", "ulChannelBandwidth"], lte_rows)
+            + ["....."]
+            + render_table(["MO", "dlChannelBandwidth", "physicalLayerCellIdGroup", "physicalLayerSubCellId", "tac",
+                            "ulChannelBandwidth"], external_rows))
+
+    nr_power_rows = [[f"NRSectorCarrier={nr_site}{sector}", "40000", "2", "2"] for sector in sectors[:nr_cells]]
+    lte_power_rows = [[f"SectorCarrier={lte_site}{sector}", rng.choice(["20000", "40000", "60000"]), "2", "2",
+                       f"{lte_site}{sector}"] for sector in sectors]
+    command("hgetc sectorcarrier ^sectorcarrierid$|^configuredMaxTxPower$|^noOfTxAntennas$|^noOfRxAntennas$",
+            (render_table(["MO", "configuredMaxTxPower", "noOfRxAntennas", "noOfTxAntennas"], nr_power_rows) + ["....."]
+             if nr_power_rows else [])
+            + render_table(["MO", "configuredMaxTxPower", "noOfRxAntennas", "noOfTxAntennas", "sectorCarrierId"],
+                           lte_power_rows))
+
+    nbiot_rows = [[f"NbIotCell=NL{index:05d}{sector}", "i[0] =", str(101 + i), f"NL{index:05d}{sector}",
+                   lte_rows[i][6], str(int(tac) + 630)] for i, sector in enumerate(sectors[:nbiot_cells])]
+    command("hgetc nbiot ^cellid$|^arfcn$|^bandw$|^tac$",
+            render_table(["MO", "availabilityStatus", "cellId", "nbIotCellId", "physicalLayerCellId", "tac"], nbiot_rows)
+            if nbiot_rows else [])
+
+    command("hgetc gnbdufunction=1 ^gnbdufunctionid$|^userlabel$",
+            render_table(["MO", "gNBDUFunctionId", "userLabel"], [["GNBDUFunction=1", "1", nr_site]]) if nr_cells else [])
+
+    nr_rows = [[f"NRCellDU={nr_site}{sector}", str(201 + i), f"{nr_site}{sector}", str(rng.randrange(1008)), tac,
+                str(rng.randrange(0, 838, 16))] for i, sector in enumerate(sectors[:nr_cells])]
+    command("hgetc nrcelldu ^nrcellduid$|^cellLocalId$|^nRTAC$|^nRPCI$|^rachRootSequence$",
+            render_table(["MO", "cellLocalId", "nRCellDUId", "nRPCI", "nRTAC", "rachRootSequence"], nr_rows)
+            if nr_rows else [])
+
+    carrier_rows = [[f"NRSectorCarrier={nr_site}{sector}", "156600", "145600", "10", "10", "160000", "2", "2"]
+                    for sector in sectors[:nr_cells]]
+    command("hgetc nrsectorcarrier ^arfcn|^bSChannelBw$|^noOfTxAntennas$|^noOfRxAntennas$|^configuredmaxtxpower$",
+            render_table(["MO", "arfcnDL", "arfcnUL", "bSChannelBwDL", "bSChannelBwUL", "configuredMaxTxPower",
+                          "noOfRxAntennas", "noOfTxAntennas"], carrier_rows) if carrier_rows else [])
+
+    # sdir: hardware table, then the RF table with two branches per RRU
+    separator = "=" * 133
+    lines.extend([f"{prompt} sdir", "", stamp, "......Checking available boards on node...", "",
+                  f"Total: {lte_cells} CPRI links ({lte_cells} OK, 0 OKW, 0 NOK, 0 NT)", ""])
+    fru_rows = [["DU-1", "000100", "BB6631", " 1", "  OFF", "  ON", "  OFF", " OFF", "KDU1370071/11", "R3H",
+                 "E96A019M4F", "20241010", "", "0.01", "", "", ""]]
+    rf_rows = []
+    for i, sector in enumerate(sectors):
+        fru = f"RRU-S{i + 1}-1"
+        board = rng.choice(["RRU2217B20", "RRU2217B28B", "RRUS11B1", "RRUS12B8"])
+        fru_rows.append([fru, f"BXP_{i + 2}", board, " 1", "  OFF", "  ON", "  OFF", " N/A", "KRC161549/1", "R1L",
+                         f"TU8U{rng.randrange(16 ** 6):06X}", "20190621", " 24.1", "0.05", "", "CXP9013268%9_R93KD", ""])
+        cells = [f"FDD={lte_site}{sector}"]
+        states = [f"1:{i + 1}:{lte_rows[i][6]}"]
+        if i < nbiot_cells:
+            cells.append(f"NIOT=NL{index:05d}{sector}")
+            states.append(f"1:{101 + i}:{lte_rows[i][6]}")
+        if i < nr_cells:
+            cells.append(f"NRC={nr_site}{sector}")
+            states.append(f"1:{201 + i}:{nr_rows[i][3]}")
+        for branch in "AB":
+            tx = rng.uniform(1, 20)
+            rf_rows.append([fru, f"BXP_{i + 2}", board, f" {branch} ", "11 ", f"{tx:.1f} ({30 + tx / 2:.1f})",
+                            f"1.{rng.randrange(10, 99)} ({rng.uniform(9, 27):.1f})", f"-{rng.uniform(70, 100):.1f}",
+                            f"{rng.randrange(40)}/-", f"SE=S{i + 1} AG=S{i + 1} {' '.join(cells)} ({', '.join(states)})"])
+    fru_table = render_table(["FRU", "LNH", "BOARD", "ST", "FAULT", "OPER", "MAINT", "STAT", "PRODUCTNUMBER", "REV",
+                              "SERIAL", "DATE", " TEMP", " UPT", "VOLT", "SW", ""], fru_rows)
+    lines.extend([separator, fru_table[0], separator] + fru_table[1:] + ["-" * 133, "", separator])
+    rf_table = render_table(["FRU", "LNH", "BOARD", "RF", "BP", "TX (W/dBm)", "VSWR (RL)", "RX (dBm)", "UEs/gUEs",
+                             "Sector/AntennaGroup/Cells (State:CellIds:PCIs)"], rf_rows)
+    lines.extend([rf_table[0], separator] + rf_table[1:] + ["-" * 133, ""])
+    return lines
+
+def write_log(path, sites, start=0, **kwargs):
+    """Write ``sites`` nodes into one concatenated log; returns the number of lines."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(start, start + sites):
+            lines = render_site(index, **kwargs)
+            file.write("\n".join(lines))
+            file.write("\n")
+            count += len(lines)
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic moshell logs for benchmarking.")
+    parser.add_argument("--sites", type=int, default=100, help="number of nodes to generate")
+    parser.add_argument("--lte-cells", type=int, default=9, help="LTE cells (and RRUs) per node")
+    parser.add_argument("--nbiot-cells", type=int, default=3, help="NB-IoT cells per node")
+    parser.add_argument("--nr-cells", type=int, default=3, help="NR cells and carriers per node")
+    parser.add_argument("--external-cells", type=int, default=7, help="ExternalEUtranCellFDD rows per node")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output", help="write all nodes into this one log")
+    output.add_argument("--split", help="write one log per node into this directory")
+    args = parser.parse_args(argv)
+
+    kwargs = dict(lte_cells=args.lte_cells, nbiot_cells=args.nbiot_cells, nr_cells=args.nr_cells,
+                  external_cells=args.external_cells)
+    if args.output:
+        lines = write_log(args.output, args.sites, **kwargs)
+        print(f"Wrote {args.sites} nodes, {lines} lines to {args.output}")
+    else:
+        os.makedirs(args.split, exist_ok=True)
+        lines = 0
+        for index in range(args.sites):
+            lines += write_log(os.path.join(args.split, f"node_{index:05d}.txt"), 1, start=index, **kwargs)
+        print(f"Wrote {args.sites} logs, {lines} lines to {args.split}")
+
+if __name__ == "__main__":
+    main()
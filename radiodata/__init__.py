@@ -0,0 +1,39 @@
+"""Radiodata generation from Ericsson moshell logs.
+
+Shared by the ``gen_radiodata.py`` CLI and the Streamlit ``app.py``. Importing
+the package only pulls in the standard library; openpyxl and pyarrow are loaded
+by the writers when a file of that format is written.
+"""
+
+from radiodata.batch import parse_profiled, run_batch
+from radiodata.cache import ResultCache, cache_key, content_digest
+from radiodata.export import generate_batch_zip, generate_zip_download, save_sites_to_excel, save_to_excel
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.parser import PARSER_VERSION, group_nodes, iter_lines, merge_nodes, parse_nodes, parse_txt_file
+from radiodata.profiling import Profile
+from radiodata.rows import RowTable
+from radiodata.writers import FORMATS, write_rows
+
+__all__ = [
+    "FORMATS",
+    "HEADERS_LTE",
+    "HEADERS_NR",
+    "PARSER_VERSION",
+    "Profile",
+    "ResultCache",
+    "RowTable",
+    "cache_key",
+    "content_digest",
+    "generate_batch_zip",
+    "generate_zip_download",
+    "group_nodes",
+    "iter_lines",
+    "merge_nodes",
+    "parse_nodes",
+    "parse_profiled",
+    "parse_txt_file",
+    "run_batch",
+    "save_sites_to_excel",
+    "save_to_excel",
+    "write_rows",
+]
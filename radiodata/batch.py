@@ -0,0 +1,133 @@
+import glob
+import os
+from io import BytesIO
+
+from radiodata.export import save_to_excel
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.parser import parse_nodes
+from radiodata.profiling import Profile
+from radiodata.rows import RowTable
+
+# Logs of at least this many bytes are split into nodes by run_batch itself and
+# the nodes parsed on its pool, so one large mobatch dump is spread over the
+# workers instead of being parsed by a single one
+SPLIT_LOG_BYTES = 8 << 20
+
+def is_large_log(path):
+    """Whether ``path`` is a log large enough to have its nodes parsed on the pool (see SPLIT_LOG_BYTES)."""
+    try:
+        return os.path.getsize(path) >= SPLIT_LOG_BYTES
+    except OSError:
+        return False
+
+def expand_inputs(inputs, list_file=None):
+    """Expand CLI inputs (files, directories, glob patterns) into a list of log paths.
+
+    Directories contribute every ``*.txt`` file directly inside them; ``list_file``
+    names a text file with one log path per line (blank lines and ``#`` comments
+    are ignored). Duplicates are dropped, first occurrence wins.
+    """
+    paths = []
+    if list_file:
+        with open(list_file, "r", encoding="utf-8") as file:
+            inputs = list(inputs) + [line.strip() for line in file if line.strip() and not line.lstrip().startswith("#")]
+
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "*.txt"))))
+        elif glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item)))
+        else:
+            paths.append(item)
+    return list(dict.fromkeys(paths))
+
+def parse_profiled(source, label, carrier_map=None, executor=None):
+    """Parse the nodes of a log path (or bytes) with a Profile labelled ``label``; returns ``(nodes, profile)``."""
+    profile = Profile(label)
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    return parse_nodes(source, carrier_map, profile, executor), profile
+
+class LazyPool:
+    """A process pool that is only started by its first submit().
+
+    Callers that may need a pool (a log that turns out to hold several nodes)
+    pass one of these, so the common case pays neither for importing
+    multiprocessing nor for starting workers.
+    """
+
+    __slots__ = ("workers", "executor")
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.executor = None
+
+    def submit(self, fn, *args, **kwargs):
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        if self.executor is not None:
+            self.executor.shutdown(wait)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+def run_batch(paths, workers=None, profile=None, carrier_map=None):
+    """Parse logs in parallel on a process pool.
+
+    Returns ``(results, failures)``: ``results`` is a list of ``(path, nodes)`` in
+    input order, where ``nodes`` is the list from parse_nodes, and
+    ``failures`` a list of ``(path, error message)``. A log that fails to parse
+    does not stop the others. Each log is parsed by one worker, except large
+    ones (see SPLIT_LOG_BYTES), which are split here and their nodes parsed
+    across the pool. With ``profile`` every log is profiled and the results
+    are merged into it. ``carrier_map`` is passed on to parse_nodes.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for path in paths:
+            if is_large_log(path):
+                futures.append((path, None))
+            elif profile is None:
+                futures.append((path, executor.submit(parse_nodes, path, carrier_map)))
+            else:
+                futures.append((path, executor.submit(parse_profiled, path, path, carrier_map)))
+        for path, future in futures:
+            try:
+                if future is not None:
+                    parsed = future.result()
+                elif profile is None:
+                    parsed = parse_nodes(path, carrier_map, executor=executor)
+                else:
+                    parsed = parse_profiled(path, path, carrier_map, executor)
+            except Exception as exc:
+                failures.append((path, f"{type(exc).__name__}: {exc}"))
+                continue
+            if profile is not None:
+                parsed, worker_profile = parsed
+                profile.merge(worker_profile)
+            results.append((path, parsed))
+    return results, failures
+
+def save_batch_to_excel(results, output_dir=".", fmt="xlsx", findings=False, profile=None):
+    """Write the rows of every parsed log into combined LTE and NR (and findings) outputs."""
+    data_lte = RowTable(HEADERS_LTE)
+    data_nr = RowTable(HEADERS_NR)
+    for path, nodes in results:
+        for node, (site, function, parsed_lte, parsed_nr) in nodes:
+            data_lte.extend(parsed_lte)
+            data_nr.extend(parsed_nr)
+    save_to_excel("Combined", "Combined", data_lte, data_nr, output_dir, fmt, findings, profile)
+    return len(data_lte), len(data_nr)
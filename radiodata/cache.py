@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# Bytes hashed per read when fingerprinting an upload
+HASH_CHUNK_SIZE = 1 << 20
+
+def content_digest(source, chunk_size=HASH_CHUNK_SIZE):
+    """Return the SHA-256 hex digest of a bytes object or a binary file object.
+
+    File objects are read in chunks and rewound afterwards, so the same upload
+    can be handed to the parser next.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+        return digest.hexdigest()
+
+    source.seek(0)
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+def cache_key(digest, *options):
+    """Build a cache key from a content digest and the options that shape the result."""
+    return (digest,) + tuple(options)
+
+class ResultCache:
+    """Thread-safe LRU cache of prepared results, bounded by total size in bytes.
+
+    Values are ``(payload, ...)`` tuples whose first item, bytes or a BytesIO,
+    is counted against ``max_bytes``. A value larger than the ceiling is
+    returned but not kept.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        payload = value[0]
+        size = payload.getbuffer().nbytes if isinstance(payload, BytesIO) else len(payload)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building and storing it with ``factory()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
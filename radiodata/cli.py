@@ -0,0 +1,121 @@
+import argparse
+import glob
+import os
+import sys
+
+from radiodata.batch import LazyPool, expand_inputs, run_batch, save_batch_to_excel
+from radiodata.export import save_sites_to_excel
+from radiodata.parser import group_nodes, load_carrier_map, parse_nodes
+from radiodata.profiling import Profile
+from radiodata.writers import FORMATS
+
+# The incremental, store and watch modes import their modules when chosen, so
+# a plain run over one log loads the parser and its writer only
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate radiodata workbooks from moshell logs.")
+    parser.add_argument("inputs", nargs="*", help="log files, directories of *.txt logs or glob patterns")
+    parser.add_argument("-l", "--list", dest="list_file", help="text file listing one log path per line")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of parser processes (default: number of CPUs)")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the generated workbooks")
+    parser.add_argument("-f", "--format", dest="fmt", choices=list(FORMATS), default="xlsx",
+                        help="output format (default: xlsx)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="only regenerate the per-site outputs of logs changed since the last run "
+                             "and write a delta report of the cells that changed")
+    parser.add_argument("--validate", action="store_true",
+                        help="also write a findings file of PCI/RACH collisions and cells missing power or RRU")
+    parser.add_argument("--store", help="also add the parsed rows to this SQLite store (see radiodata.store)")
+    parser.add_argument("--manifest", help="manifest file for --incremental (default: OUTPUT_DIR/.radiodata_manifest.json)")
+    parser.add_argument("--carrier-map", metavar="CSV",
+                        help="carrier,cell CSV naming the NRCellDU of NRSectorCarriers that the log "
+                             "does not link to a cell itself")
+    parser.add_argument("--profile", action="store_true",
+                        help="print the time, lines, rows and bytes of every parser section and writer to stderr")
+    parser.add_argument("--profile-jsonl", metavar="PATH",
+                        help="also write the per-log profile records as JSON lines to PATH (implies --profile)")
+    parser.add_argument("-w", "--watch", metavar="INBOX",
+                        help="keep running and process every *.txt log dropped into INBOX as it arrives "
+                             "(processed logs are moved to INBOX/done or INBOX/failed)")
+    parser.add_argument("--poll", type=float, default=None, help="seconds between scans of the --watch inbox")
+    args = parser.parse_args(argv)
+    try:
+        args.carrier_map = load_carrier_map(args.carrier_map) if args.carrier_map else None
+    except (OSError, ValueError) as exc:
+        parser.error(f"--carrier-map: {exc}")
+
+    if args.watch:
+        if not os.path.isdir(args.watch):
+            parser.error(f"--watch: {args.watch} is not a directory")
+        from radiodata.watch import POLL_SECONDS, watch_inbox
+
+        print(f"Watching {args.watch} for logs (Ctrl+C to stop)", flush=True)
+        try:
+            watch_inbox(args.watch, args.output_dir, args.fmt, args.validate, args.store, args.workers,
+                        args.poll or POLL_SECONDS, args.carrier_map)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    paths = expand_inputs(args.inputs, args.list_file)
+    if not paths:
+        parser.error("no input logs given")
+
+    profile = Profile() if args.profile or args.profile_jsonl else None
+    status = run(args, paths, profile)
+    if profile is not None:
+        print(profile.format(), file=sys.stderr)
+        if args.profile_jsonl:
+            profile.write_jsonl(args.profile_jsonl)
+    return status
+
+def run(args, paths, profile=None):
+    if args.store:
+        from radiodata.store import ingest_results
+
+    if args.incremental:
+        from radiodata.incremental import run_incremental
+
+        summary = run_incremental(paths, args.output_dir, args.fmt, args.workers, args.manifest, args.validate,
+                                  profile, args.carrier_map)
+        changes = {}
+        for row in summary["delta"]:
+            changes.setdefault(row["CHANGE"], set()).add((row["TECH"], row["CELL"]))
+        print(f"{len(summary['skipped'])} unchanged, {len(summary['parsed'])} regenerated, "
+              f"{len(summary['failures'])} failed; cells "
+              + ", ".join(f"{len(changes.get(change, ()))} {change}" for change in ("added", "removed", "changed")))
+        if summary["delta_path"]:
+            print(f"Delta report: {summary['delta_path']}")
+        if args.store:
+            ingest_results(args.store, summary["results"])
+        for path, error in summary["failures"]:
+            print(f"FAILED {path}: {error}", file=sys.stderr)
+        return 1 if summary["failures"] else 0
+
+    # A single log keeps the per-site outputs
+    batch = args.list_file or len(paths) > 1 or any(os.path.isdir(item) or glob.has_magic(item) for item in args.inputs)
+    if not batch:
+        if profile is not None:
+            profile.label = paths[0]
+        # A log of many nodes has them parsed in parallel; the pool is only
+        # started once a second node turns up
+        with LazyPool(args.workers) as executor:
+            nodes = parse_nodes(paths[0], args.carrier_map, profile, executor)
+        # Every node of the log gets its own site's outputs
+        save_sites_to_excel(group_nodes(nodes), args.output_dir, args.fmt, args.validate, profile)
+        if args.store:
+            ingest_results(args.store, [(paths[0], nodes)])
+        return 0
+
+    results, failures = run_batch(paths, args.workers, profile, args.carrier_map)
+    lte_rows, nr_rows = save_batch_to_excel(results, args.output_dir, args.fmt, args.validate, profile)
+    if args.store:
+        ingest_results(args.store, results)
+    print(f"Parsed {len(results)}/{len(paths)} logs: {lte_rows} LTE rows, {nr_rows} NR rows")
+    for path, error in failures:
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
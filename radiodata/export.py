@@ -0,0 +1,201 @@
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.profiling import timed
+from radiodata.rows import RowTable
+from radiodata.validate import FINDINGS_HEADERS, validate
+from radiodata.writers import FORMATS, write_rows
+
+# Threads rendering ZIP entries besides the one streamed by the caller
+ZIP_WORKERS = 4
+
+# Deflate level of the ZIP downloads of the app and the HTTP service
+# (unset: zlib default, 0: store the files as they are)
+ZIP_LEVEL = int(os.environ["RADIODATA_ZIP_LEVEL"]) if os.environ.get("RADIODATA_ZIP_LEVEL") else None
+
+def save_to_excel(site, function, data_lte, data_nr, output_dir=".", fmt="xlsx", findings=False, profile=None):
+    """Write the LTE and NR rows to ``{site}_Radiodata_LTE_{date}`` / ``{function}_Radiodata_NR_{date}``.
+
+    ``fmt`` picks the writer ("xlsx", "csv" or "parquet"); the files get the
+    matching extension. With ``findings`` the validate() results go to
+    ``{site}_Radiodata_Findings_{date}`` as well. Each write is timed as
+    ``"{fmt} write"`` in ``profile`` when one is given. Returns the paths written.
+    """
+    date_str = datetime.now().strftime("%Y%m%d")
+    extension = FORMATS[fmt]
+    written = []
+
+    outputs = []
+    if data_lte:
+        outputs.append((f"{site}_Radiodata_LTE_{date_str}.{extension}", data_lte, HEADERS_LTE, "LTE"))
+    if data_nr:
+        outputs.append((f"{function}_Radiodata_NR_{date_str}.{extension}", data_nr, HEADERS_NR, "NR"))
+    if findings and outputs:
+        outputs.append((f"{site or function}_Radiodata_Findings_{date_str}.{extension}", validate(data_lte, data_nr),
+                        FINDINGS_HEADERS, "Findings"))
+
+    for name, rows, headers, sheet_name in outputs:
+        output_file = os.path.join(output_dir, name)
+        with timed(profile, f"{fmt} write") as counters:
+            write_rows(rows, headers, output_file, fmt, sheet_name=sheet_name)
+            counters["rows"] = len(rows)
+            counters["bytes"] = os.path.getsize(output_file)
+        written.append(output_file)
+
+    return written
+
+def save_sites_to_excel(sites, output_dir=".", fmt="xlsx", findings=False, profile=None):
+    """Write the outputs of every site of a log (see group_nodes) with save_to_excel; returns the paths written."""
+    written = []
+    for site, function, data_lte, data_nr in sites:
+        written.extend(save_to_excel(site, function, data_lte, data_nr, output_dir, fmt, findings, profile))
+    return written
+
+def generate_zip_download(site, function, data_lte, data_nr, fmt="xlsx", findings=False, compresslevel=None, profile=None):
+    """Build the ZIP of one site's LTE and NR files (and findings); returns ``(buffer, name)``.
+
+    The files are written concurrently, see write_zip_entries. ``compresslevel``
+    is the deflate level (None for zlib's default); 0 stores the files as they
+    are, which is quickest for the already compressed xlsx and Parquet.
+    Each file is timed as ``"{fmt} write"`` in ``profile`` when one is given.
+    """
+    date_str = datetime.now().strftime("%Y%m%d")
+    extension = FORMATS[fmt]
+    zip_buffer = BytesIO()
+    entries = []
+    if data_lte:
+        entries.append((f"{site}_LTE_{date_str}.{extension}", data_lte, HEADERS_LTE, 'LTE'))
+    if data_nr:
+        entries.append((f"{function}_NR_{date_str}.{extension}", data_nr, HEADERS_NR, 'NR'))
+    if findings and entries:
+        entries.append((f"{site or function}_Findings_{date_str}.{extension}", lambda: validate(data_lte, data_nr),
+                        FINDINGS_HEADERS, 'Findings'))
+
+    with open_zip(zip_buffer, compresslevel) as zipf:
+        write_zip_entries(zipf, entries, fmt, profile=profile)
+
+    zip_buffer.seek(0)
+    zip_filename = f"{function if data_nr else site}_RadioData_{date_str}.zip"
+    return zip_buffer, zip_filename
+
+def open_zip(target, compresslevel=None):
+    """Open a ZIP for writing: deflated at ``compresslevel``, or stored when it is 0."""
+    if compresslevel == 0:
+        return zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED)
+    return zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+
+def zip_info(zipf, name):
+    """A ZipInfo for a new entry of ``zipf``, dated now and compressed like its other entries.
+
+    zipf.open() given a bare name would date the entry 1980-01-01. The entry
+    gets zlib's default level, so it is only used when ``zipf`` has no other.
+    """
+    info = zipfile.ZipInfo(name, time.localtime()[:6])
+    info.compress_type = zipf.compression
+    return info
+
+def render_entry(rows, headers, fmt, sheet_name, profile=None):
+    with timed(profile, f"{fmt} write") as counters:
+        rows = rows() if callable(rows) else rows
+        buffer = BytesIO()
+        write_rows(rows, headers, buffer, fmt, sheet_name=sheet_name)
+        counters["rows"] = len(rows)
+        counters["bytes"] = buffer.tell()
+    return buffer
+
+def write_zip_entries(zipf, entries, fmt, workers=ZIP_WORKERS, profile=None):
+    """Write ``(name, rows, headers, sheet_name)`` entries into ``zipf`` in order.
+
+    The first entry is streamed straight into the archive on this thread while
+    worker threads render the following ones into buffers; each buffer is
+    copied into the archive and dropped as soon as its turn comes, and at most
+    ``workers`` are pending at a time. ``rows`` may be a function returning
+    the rows, so expensive ones are also built off this thread. An archive
+    with an explicit deflate level has its first entry rendered like the
+    others, as a streamed entry cannot be given a level.
+    """
+    if not entries:
+        return
+    stream_first = zipf.compresslevel is None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        queued = iter(entries[1:] if stream_first else entries)
+
+        def submit():
+            for name, rows, headers, sheet_name in queued:
+                pending.append((name, executor.submit(render_entry, rows, headers, fmt, sheet_name, profile)))
+                if len(pending) >= workers:
+                    break
+
+        submit()
+        if stream_first:
+            name, rows, headers, sheet_name = entries[0]
+            with timed(profile, f"{fmt} write") as counters:
+                rows = rows() if callable(rows) else rows
+                with zipf.open(zip_info(zipf, name), "w") as stream:
+                    write_rows(rows, headers, stream, fmt, sheet_name=sheet_name)
+                counters["rows"] = len(rows)
+                counters["bytes"] = zipf.getinfo(name).file_size
+        while pending:
+            name, future = pending.popleft()
+            submit()
+            buffer = future.result()
+            with buffer.getbuffer() as view:
+                zipf.writestr(name, view)
+            buffer.close()
+
+def generate_batch_zip(results, fmt="xlsx", findings=False, compresslevel=None, profile=None):
+    """Build one ZIP with every site's LTE/NR files plus merged LTE and NR files.
+
+    ``results`` is a list of per-site tuples as returned by group_nodes. Per-site
+    files go under ``sites/``; a site seen twice gets a numbered name. With
+    ``findings`` the checks of validate() run over the merged rows, so
+    collisions between sites are caught, and go to a merged findings file.
+    Files are written concurrently as in generate_zip_download.
+    """
+    date_str = datetime.now().strftime("%Y%m%d")
+    extension = FORMATS[fmt]
+    zip_buffer = BytesIO()
+    used_names = set()
+    merged_lte = RowTable(HEADERS_LTE)
+    merged_nr = RowTable(HEADERS_NR)
+
+    def unique_name(name):
+        stem, count = name, 1
+        while name in used_names:
+            count += 1
+            name = f"{stem}_{count}"
+        used_names.add(name)
+        return name
+
+    entries = []
+    for site, function, data_lte, data_nr in results:
+        if data_lte:
+            name = unique_name(f"sites/{site}_LTE_{date_str}")
+            entries.append((f"{name}.{extension}", data_lte, HEADERS_LTE, 'LTE'))
+            merged_lte.extend(data_lte)
+        if data_nr:
+            name = unique_name(f"sites/{function}_NR_{date_str}")
+            entries.append((f"{name}.{extension}", data_nr, HEADERS_NR, 'NR'))
+            merged_nr.extend(data_nr)
+
+    if merged_lte:
+        entries.append((f"Merged_LTE_{date_str}.{extension}", merged_lte, HEADERS_LTE, 'LTE'))
+    if merged_nr:
+        entries.append((f"Merged_NR_{date_str}.{extension}", merged_nr, HEADERS_NR, 'NR'))
+    if findings and (merged_lte or merged_nr):
+        entries.append((f"Merged_Findings_{date_str}.{extension}", lambda: validate(merged_lte, merged_nr),
+                        FINDINGS_HEADERS, 'Findings'))
+
+    with open_zip(zip_buffer, compresslevel) as zipf:
+        write_zip_entries(zipf, entries, fmt, profile=profile)
+
+    zip_buffer.seek(0)
+    zip_filename = f"RadioData_{len(results)}_sites_{date_str}.zip"
+    return zip_buffer, zip_filename
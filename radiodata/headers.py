@@ -0,0 +1,50 @@
+# Define the headers
+HEADERS_LTE = [
+    "EPC", "SITE", "NAME", "ALTITUDE", "SECTOR", "HEIGHT", "BEAMDIRECTION", "MTILT", "ETILT", "GEODATUM",
+    "LATITUDE", "LATHEMISPHERE", "LONGITUDE", "LONGHEMISPHERE", "RET", "ATTENUATION", "DELAY", "ANTENNATYPE",
+    "CELL", "BPLMNLIST", "BPLMNLIST_MNC", "TAC", "ENODEBID", "CELLID", "PCI", "PCIG", "PSCI", "CONFOUTPUTPOWER",
+    "PARTOFRADIOPOWER", "CHANNEL_NO_UL", "CHANNEL_NO_DL", "UL_BANDWIDTH", "DL_BANDWIDTH", "RACHROOTSEQUENCE",
+    "CSFALLBACKPRIOGERAN", "CSFALLBACKPRIOUTRAN", "GSMFREQGROUPID", "TMA", "RRU", "TXANTENNAS", "RXANTENNAS",
+    "SECONDARYANTENNAS", "VFID", "RF_TX_DBM", "RF_VSWR", "RF_RX_DBM"
+]
+
+HEADERS_NR = [
+    "MECONTEXT", "FUNCTION", "CELL", "CELLID", "CHANNEL_NO_DL", "CHANNEL_NO_UL", "TAC", "PCI", "CONFOUTPUTPOWER",
+    "RACHROOTSEQUENCE", "DL_BANDWIDTH", "UL_BANDWIDTH", "TXANTENNAS", "RXANTENNAS", "BEAMDIRECTION", "MTILT", "ETILT",
+    "GEODATUM", "LATITUDE", "LATHEMISPHERE", "LONGITUDE", "LONGHEMISPHERE", "RRU", "ANTENNATYPE", "SECONDARYANTENNAS", "RET", "VFID",
+    "RF_TX_DBM", "RF_VSWR", "RF_RX_DBM"
+]
+
+# Per-operator constants, the same on every row of the LTE / NR outputs. They
+# are applied once per column (see RowTable) rather than copied into each row.
+CONSTANTS_LTE = {
+    "GEODATUM": "DHDN",
+    "LATHEMISPHERE": "N",
+    "LONGHEMISPHERE": "E",
+    "ENODEBID": "null",
+    "GSMFREQGROUPID": "10",
+    "BPLMNLIST": "262",
+    "BPLMNLIST_MNC": "2",
+    "ATTENUATION": "0",
+    "DELAY": "0",
+}
+
+CONSTANTS_NR = {
+    "MTILT": "0",
+    "GEODATUM": "DHDN",
+    "LATHEMISPHERE": "N",
+    "LONGHEMISPHERE": "E",
+    "SECONDARYANTENNAS": "NONE",
+}
+
+# NB-IoT carrier values; the NbIotCell table does not list them
+CONSTANTS_NBIOT = {
+    "CHANNEL_NO_UL": "6346",
+    "CHANNEL_NO_DL": "24346",
+    "UL_BANDWIDTH": "1400",
+    "DL_BANDWIDTH": "1400",
+    "RACHROOTSEQUENCE": "100",
+    "CONFOUTPUTPOWER": "3170",
+    "TXANTENNAS": "2",
+    "RXANTENNAS": "2",
+}
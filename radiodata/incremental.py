@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from radiodata.batch import run_batch
+from radiodata.cache import content_digest
+from radiodata.export import save_sites_to_excel
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.parser import PARSER_VERSION, group_nodes, merge_nodes
+from radiodata.writers import write_rows
+
+# Manifest written next to the outputs unless --manifest points elsewhere
+MANIFEST_NAME = ".radiodata_manifest.json"
+MANIFEST_VERSION = 1
+
+# Cell columns the delta report compares value by value; a change anywhere
+# else in the row is reported as FIELD "*"
+DELTA_FIELDS = ("PCI", "TAC", "CHANNEL_NO_DL", "CHANNEL_NO_UL", "CONFOUTPUTPOWER")
+
+DELTA_HEADERS = ["SITE", "TECH", "CELL", "CHANGE", "FIELD", "OLD", "NEW"]
+
+def load_manifest(path):
+    """Read the manifest at ``path``; a missing or outdated one starts empty."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        manifest = {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "inputs": {}}
+    return manifest
+
+def save_manifest(path, manifest):
+    """Write the manifest atomically, so an interrupted run keeps the old one."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def file_digest(path):
+    with open(path, "rb") as file:
+        return content_digest(file)
+
+def carrier_map_digest(carrier_map):
+    """Hash a carrier map, so a changed map regenerates the logs it was applied to; None for no map."""
+    if not carrier_map:
+        return None
+    return hashlib.sha1(json.dumps(carrier_map, sort_keys=True).encode("utf-8")).hexdigest()
+
+def cell_fingerprints(data_lte, data_nr):
+    """Map ``"TECH:CELL"`` to the cell's site, DELTA_FIELDS values and a hash of its whole row."""
+    cells = {}
+    for tech, rows, headers, site_column in (("LTE", data_lte, HEADERS_LTE, "SITE"), ("NR", data_nr, HEADERS_NR, "FUNCTION")):
+        cell_index = headers.index("CELL")
+        site_index = headers.index(site_column)
+        positions = [(field, headers.index(field)) for field in DELTA_FIELDS]
+        for values in rows.iter_values(headers):
+            row_hash = hashlib.sha1("\x1f".join("" if value is None else str(value) for value in values).encode("utf-8"))
+            entry = {field: values[index] for field, index in positions}
+            entry["hash"] = row_hash.hexdigest()
+            entry["site"] = values[site_index]
+            cells[f"{tech}:{values[cell_index]}"] = entry
+    return cells
+
+def diff_cells(site, old_cells, new_cells):
+    """Return delta report rows for the cells added, removed or changed between two fingerprints.
+
+    Cells are reported under the site recorded in their fingerprint (several
+    nodes may share a log), falling back to ``site``.
+    """
+    delta = []
+    for key in sorted(set(old_cells) | set(new_cells)):
+        tech, cell = key.split(":", 1)
+        old, new = old_cells.get(key), new_cells.get(key)
+        row = {"SITE": (new or old).get("site") or site, "TECH": tech, "CELL": cell}
+        if old is None:
+            delta.append(dict(row, CHANGE="added"))
+        elif new is None:
+            delta.append(dict(row, CHANGE="removed"))
+        elif old["hash"] != new["hash"]:
+            fields = [field for field in DELTA_FIELDS if old.get(field) != new.get(field)]
+            for field in fields:
+                delta.append(dict(row, CHANGE="changed", FIELD=field, OLD=old.get(field), NEW=new.get(field)))
+            if not fields:
+                delta.append(dict(row, CHANGE="changed", FIELD="*"))
+    return delta
+
+def is_unchanged(entry, digest, fmt, map_digest=None, findings=False):
+    """Whether a manifest entry still describes the current log and its outputs."""
+    return (
+        entry is not None
+        and entry.get("digest") == digest
+        and entry.get("parser_version") == PARSER_VERSION
+        and entry.get("format") == fmt
+        and entry.get("carrier_map") == map_digest
+        and entry.get("findings", False) == findings
+        and all(os.path.exists(output) for output in entry.get("outputs", []))
+    )
+
+def run_incremental(paths, output_dir=".", fmt="xlsx", workers=None, manifest_path=None, findings=False,
+                    profile=None, carrier_map=None):
+    """Regenerate the per-site outputs of the logs that changed since the last run.
+
+    Each log's content hash is checked against the manifest first; unchanged logs
+    (same content, parser version, format, ``findings`` and ``carrier_map``,
+    outputs still present) are not read any further. Changed logs are parsed
+    in parallel, their per-site files rewritten and their cells compared with
+    the fingerprints recorded last time.
+    The differences go to ``radiodata_delta_{date}.csv`` in ``output_dir``.
+
+    Returns a dict with the ``skipped``, ``parsed`` and ``failures`` paths, the
+    ``results`` of the logs parsed, the ``delta`` rows and the ``delta_path``
+    (None when nothing changed).
+    """
+    manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    inputs = manifest["inputs"]
+    map_digest = carrier_map_digest(carrier_map)
+
+    skipped = []
+    changed = {}
+    for path in paths:
+        key = os.path.abspath(path)
+        digest = file_digest(path)
+        if is_unchanged(inputs.get(key), digest, fmt, map_digest, findings):
+            skipped.append(path)
+        else:
+            changed[path] = digest
+
+    results, failures = run_batch(list(changed), workers, profile, carrier_map)
+
+    delta = []
+    for path, nodes in results:
+        site, function, data_lte, data_nr = merge_nodes(nodes)
+        key = os.path.abspath(path)
+        cells = cell_fingerprints(data_lte, data_nr)
+        old_cells = inputs.get(key, {}).get("cells", {})
+        delta.extend(diff_cells(site or function, old_cells, cells))
+        outputs = save_sites_to_excel(group_nodes(nodes), output_dir, fmt, findings, profile)
+        inputs[key] = {
+            "digest": changed[path],
+            "parser_version": PARSER_VERSION,
+            "format": fmt,
+            "carrier_map": map_digest,
+            "findings": findings,
+            "site": site,
+            "function": function,
+            "outputs": [os.path.abspath(output) for output in outputs],
+            "cells": cells,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+    save_manifest(manifest_path, manifest)
+
+    delta_path = None
+    if delta:
+        date_str = datetime.now().strftime("%Y%m%d")
+        delta_path = os.path.join(output_dir, f"radiodata_delta_{date_str}.csv")
+        write_rows(delta, DELTA_HEADERS, delta_path, "csv")
+
+    return {
+        "skipped": skipped,
+        "parsed": [path for path, _ in results],
+        "results": results,
+        "failures": failures,
+        "delta": delta,
+        "delta_path": delta_path,
+    }
@@ -0,0 +1,449 @@
+import codecs
+import csv
+import logging
+import os
+import re
+from collections import deque
+from itertools import chain, groupby, islice
+
+from radiodata.headers import CONSTANTS_LTE, CONSTANTS_NBIOT, CONSTANTS_NR, HEADERS_LTE, HEADERS_NR
+from radiodata.profiling import Profile, run_handlers_profiled, timed
+from radiodata.rows import RowTable
+from radiodata.sdir import RfTable
+from radiodata.sections import RF_TABLE, SECTION_RE, iter_table_rows, table_handler
+
+logger = logging.getLogger(__name__)
+
+# Characters (or bytes) read from a file object at a time; only this window
+# and the line being assembled are held in memory, whatever the log size
+READ_CHUNK_SIZE = 1 << 16
+
+# Lines before a log's first prompt (a banner) are held back to go with the
+# first node; a log with more than this before any prompt keeps them apart
+LEADING_LINES = 1000
+
+# When the nodes of a multi-node log are parsed on an executor, about this many
+# lines of log go to a worker per task, with at most NODE_TASKS_IN_FLIGHT tasks
+# held in memory at once
+NODE_TASK_LINES = 20000
+NODE_TASKS_IN_FLIGHT = 16
+
+# Bump whenever a change alters the rows produced for the same log, so cached
+# results built by an older parser are not served
+PARSER_VERSION = 8
+
+# Separators after which the rest of an NRSectorCarrier id may be dropped to
+# find its cell (WPVC68A-1 -> WPVC68A)
+CARRIER_SEPARATOR_RE = re.compile(r"[-_.]")
+
+def carrier_id(mo):
+    """Return the NRSectorCarrier id from an MO column such as ``NRSectorCarrier=SRV618A``."""
+    return mo.rsplit("NRSectorCarrier=", 1)[-1].split(",")[0].strip()
+
+def carrier_prefixes(carrier):
+    """Yield the parts of a carrier id before each ``-``, ``_`` or ``.``, longest first.
+
+    ``WPVC68A-1`` yields ``WPVC68A``; ``WPVC68AB-1`` yields ``WPVC68AB`` but
+    never ``WPVC68A``.
+    """
+    for match in reversed(list(CARRIER_SEPARATOR_RE.finditer(carrier))):
+        yield carrier[:match.start()]
+
+def join_nr_carriers(data_nr, nr_carriers, carrier_map=None):
+    """Merge NRSectorCarrier rows onto their NRCellDU rows.
+
+    Carriers are matched to cells through a dict index, in order of preference:
+    the cell's own nRSectorCarrierRef, the explicit ``carrier_map`` (carrier id
+    -> cell name) and a cell named like the carrier. A carrier none of these
+    match goes to the cell named like the longest part of its id before a
+    separator (``WPVC68A-1`` -> ``WPVC68A``), unless that cell is already
+    matched or claimed by another such carrier. Every carrier is applied to at
+    most one cell. Returns the ids of the carriers that matched no single cell.
+    """
+    cells = {item["CELL"]: item for item in data_nr}
+    carrier_to_cell = {carrier: carrier for carrier in cells}
+    carrier_to_cell.update(carrier_map or {})
+    for item in data_nr:
+        for carrier in re.findall(r"NRSectorCarrier=([^\s,;]+)", item.pop("SECTORCARRIERREF", "")):
+            carrier_to_cell[carrier] = item["CELL"]
+
+    unmatched = []
+    matched_cells = set()
+    fallback = {}
+    for carrier in nr_carriers:
+        carrier_name = carrier_id(carrier.pop("MO", ""))
+        cell = carrier_to_cell.get(carrier_name)
+        if cell in cells:
+            cells[cell].update(carrier)
+            matched_cells.add(cell)
+            continue
+        cell = next((prefix for prefix in carrier_prefixes(carrier_name) if prefix in cells), None)
+        if cell is None:
+            unmatched.append(carrier_name)
+        else:
+            fallback.setdefault(cell, []).append((carrier_name, carrier))
+
+    # A cell that two carriers fall back to, or that is matched already, could
+    # take either carrier's values; none is applied
+    for cell, carriers in fallback.items():
+        if len(carriers) == 1 and cell not in matched_cells:
+            cells[cell].update(carriers[0][1])
+        else:
+            unmatched.extend(carrier_name for carrier_name, carrier in carriers)
+    return list(dict.fromkeys(unmatched))
+
+def load_carrier_map(path):
+    """Read a ``carrier,cell`` CSV into a carrier id -> NRCellDU name dict.
+
+    Blank lines, ``#`` comments and a ``carrier,cell`` header row are skipped.
+    """
+    carrier_map = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) < 2:
+                raise ValueError(f"{path}: expected 'carrier,cell', got {','.join(row)!r}")
+            carrier, cell = row[0].strip(), row[1].strip()
+            if (carrier.lower(), cell.lower()) == ("carrier", "cell"):
+                continue
+            carrier_map[carrier] = cell
+    return carrier_map
+
+def iter_chunks(file, chunk_size=READ_CHUNK_SIZE):
+    """Yield fixed-size chunks read from a text or binary file object."""
+    read = file.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def iter_lines(source, encoding="utf-8", errors="replace"):
+    """Yield the text lines of a log one at a time.
+
+    ``source`` is a file path, a file object (text or binary) or any iterable of
+    bytes/str chunks. File objects are read READ_CHUNK_SIZE at a time and
+    chunks do not have to end on line boundaries, so only the current chunk
+    and line are ever held in memory. Bytes that do not decode are handled per
+    ``errors`` (replaced by default) rather than failing the whole log.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield from iter_lines(file, encoding, errors)
+        return
+    if hasattr(source, "read"):
+        source = iter_chunks(source)
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    tail = ""
+    for chunk in source:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        if "\n" not in chunk:
+            tail += chunk
+            continue
+        lines = (tail + chunk).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+class ParseState:
+    """Values collected from one log while its tables are read."""
+
+    def __init__(self):
+        self.site = ""  # To store SITE value
+        self.function = ""  # To store gNBDUFunction value
+        self.data_lte = []   # List to store parsed LTE data
+        self.data_nbiot = []  # List to store parsed NB-IoT data
+        self.data_nr = []    # List to store parsed NR data
+        self.nr_carriers = []  # NRSectorCarrier rows, joined onto data_nr at the end
+        self.power_data = {}  # Dictionary to store sectorCarrierId mappings
+        self.rf_table = RfTable()  # sdir RF table, indexed by cell
+
+# Extract SITE value
+@table_handler("ENodeBFunction", {"SITE": "userLabel"}, section="SITE")
+def handle_enodeb_function(state, row):
+    state.site = state.site or row.get("SITE", "")
+
+@table_handler("GNBDUFunction", {"FUNCTION": "userLabel"}, section="SITE")
+def handle_gnbdu_function(state, row):
+    state.function = state.function or row.get("FUNCTION", "")
+    state.site = state.site or state.function
+
+# Extract power data from the sectorcarrier table
+@table_handler("SectorCarrier", {
+    "SECTORCARRIER": "sectorCarrierId",
+    "CONFOUTPUTPOWER": "configuredMaxTxPower",
+    "TXANTENNAS": "noOfTxAntennas",
+    "RXANTENNAS": "noOfRxAntennas",
+})
+def handle_sector_carrier(state, row):
+    state.power_data[row.pop("SECTORCARRIER", "")] = row
+
+# Extract data from the EUtranCellFDD table
+@table_handler("EUtranCellFDD", {
+    "CELL": "eUtranCellFDDId",
+    "TAC": "tac",
+    "CELLID": "cellId",
+    "PCI": "physicalLayerCellId",
+    "PCIG": "physicalLayerCellIdGroup",
+    "PSCI": "physicalLayerSubCellId",
+    "CHANNEL_NO_UL": "earfcnul",
+    "CHANNEL_NO_DL": "earfcndl",
+    "UL_BANDWIDTH": "ulChannelBandwidth",
+    "DL_BANDWIDTH": "dlChannelBandwidth",
+    "RACHROOTSEQUENCE": "rachRootSequence",
+})
+def handle_eutran_cell(state, row):
+    state.data_lte.append(row)
+
+# Extract data from the NB-IoT cell table
+@table_handler("NbIotCell", {
+    "CELL": "nbIotCellId",
+    "TAC": "tac",
+    "CELLID": "cellId",
+    "PCI": "physicalLayerCellId",
+})
+def handle_nbiot_cell(state, row):
+    pci = row.get("PCI", "")
+    if pci.isdigit():
+        row["PCIG"] = str(int(pci) // 3)
+        row["PSCI"] = str(int(pci) % 3)
+    row.update(CONSTANTS_NBIOT)
+    state.data_nbiot.append(row)
+
+# Extract NR Cell Data
+@table_handler("NRCellDU", {
+    "CELL": "nRCellDUId",
+    "CELLID": "cellLocalId",
+    "TAC": "nRTAC",
+    "PCI": "nRPCI",
+    "RACHROOTSEQUENCE": "rachRootSequence",
+    "SECTORCARRIERREF": "nRSectorCarrierRef",
+})
+def handle_nr_cell(state, row):
+    state.data_nr.append(row)
+
+# Extract NR Sector Carrier Data. Both the nrsectorcarrier and the sectorcarrier
+# commands list these; each row contributes whichever attributes it has.
+@table_handler("NRSectorCarrier", {
+    "MO": "MO",
+    "CHANNEL_NO_DL": "arfcnDL",
+    "CHANNEL_NO_UL": "arfcnUL",
+    "DL_BANDWIDTH": "bSChannelBwDL",
+    "UL_BANDWIDTH": "bSChannelBwUL",
+    "CONFOUTPUTPOWER": "configuredMaxTxPower",
+    "RXANTENNAS": "noOfRxAntennas",
+    "TXANTENNAS": "noOfTxAntennas",
+})
+def handle_nr_sector_carrier(state, row):
+    state.nr_carriers.append(row)
+
+#Extract RRU from sdir
+@table_handler(RF_TABLE, section="sdir/RRU")
+def handle_rf_row(state, parts):
+    state.rf_table.add_row(parts)
+
+def node_key():
+    """Return a groupby key giving each line the node of the last prompt before it.
+
+    Prompts are recognised as by iter_table_rows; lines before the first one get None.
+    """
+    node = None
+    match_section = SECTION_RE.match
+
+    def key(line):
+        nonlocal node
+        if ">" in line:
+            match = match_section(line)
+            if match is not None and match.lastgroup == "prompt":
+                node = match.group("node")
+        return node
+    return key
+
+def split_nodes(lines):
+    """Yield ``(node, lines)`` for each run of lines under one node's prompt.
+
+    Lines before the first prompt go with the first node (up to LEADING_LINES
+    of them; more are yielded on their own under node None, as is a log
+    without any prompt). Each ``lines`` iterator must be consumed before the
+    next pair is taken.
+    """
+    leading = []
+    for node, group in groupby(lines, node_key()):
+        if node is None:
+            leading = list(islice(group, LEADING_LINES + 1))
+            if len(leading) > LEADING_LINES:
+                yield None, chain(leading, group)
+                leading = []
+            continue
+        yield node, chain(leading, group)
+        leading = []
+    if leading:
+        yield None, iter(leading)
+
+def parse_txt_file(txt_file, carrier_map=None, profile=None, executor=None):
+    """Parse a moshell log into ``(site, function, data_lte, data_nr)``.
+
+    A log of several nodes is split where the prompt changes and every node is
+    parsed on its own (see parse_nodes); the rows keep their own node's SITE
+    and FUNCTION, and ``site``/``function`` are those of the first node.
+    Callers writing per-site outputs use parse_nodes and group_nodes instead.
+    """
+    return merge_nodes(parse_nodes(txt_file, carrier_map, profile, executor))
+
+def merge_nodes(nodes):
+    """Merge the ``[(node, parsed), ...]`` of parse_nodes into one ``(site, function, data_lte, data_nr)``.
+
+    ``site`` and ``function`` are the first ones any node has.
+    """
+    site, function, data_lte, data_nr = nodes[0][1]
+    if len(nodes) > 1:
+        data_lte = RowTable(HEADERS_LTE)
+        data_nr = RowTable(HEADERS_NR)
+        for node, (node_site, node_function, node_lte, node_nr) in nodes:
+            site = site or node_site
+            function = function or node_function
+            data_lte.extend(node_lte)
+            data_nr.extend(node_nr)
+    return site, function, data_lte, data_nr
+
+def group_nodes(nodes):
+    """Return the ``(site, function, data_lte, data_nr)`` of each site of a log, in log order.
+
+    These are what the per-site outputs are written from. Nodes without rows
+    are left out, and nodes of the same site and function (a node dumped
+    twice) are merged; a log without any rows gives its merged empty tables.
+    """
+    groups = {}
+    for node, (site, function, data_lte, data_nr) in nodes:
+        if data_lte or data_nr:
+            groups.setdefault((site, function), []).append((node, (site, function, data_lte, data_nr)))
+    if not groups:
+        return [merge_nodes(nodes)]
+    return [merge_nodes(group) for group in groups.values()]
+
+def parse_nodes(txt_file, carrier_map=None, profile=None, executor=None):
+    """Parse every node of a log on its own; returns ``[(node, parsed), ...]`` in log order.
+
+    The log is streamed once and split at each change of the prompt's node
+    (see split_nodes). The first node is
+    parsed as it is read; the later ones are collected into tasks of about
+    NODE_TASK_LINES lines and parsed on ``executor`` when one is given, so a
+    concatenated mobatch dump of many nodes is spread over its workers. A
+    single-node log never leaves this process.
+    """
+    label = None if profile is None else profile.label
+    nodes = []
+    pending = deque()
+    task_nodes, task_texts, task_lines = [], [], 0
+
+    def submit():
+        if len(pending) >= NODE_TASKS_IN_FLIGHT:
+            collect(*pending.popleft())
+        pending.append((list(task_nodes), executor.submit(parse_node_texts, list(task_texts), carrier_map, label)))
+        task_nodes.clear()
+        task_texts.clear()
+
+    def collect(names, future):
+        parsed = future.result()
+        if profile is not None:
+            parsed, worker_profile = parsed
+            profile.merge(worker_profile)
+        nodes.extend(zip(names, parsed))
+
+    for index, (node, lines) in enumerate(split_nodes(iter_lines(txt_file))):
+        if index == 0 or executor is None:
+            nodes.append((node, parse_node(lines, carrier_map, profile)))
+            continue
+        lines = list(lines)
+        task_nodes.append(node)
+        task_texts.append("\n".join(lines))
+        task_lines += len(lines)
+        if task_lines >= NODE_TASK_LINES:
+            submit()
+            task_lines = 0
+    if task_nodes:
+        submit()
+    while pending:
+        collect(*pending.popleft())
+    if not nodes:
+        nodes.append((None, parse_node((), carrier_map, profile)))
+    if profile is not None:
+        # Named like the merged log: its first site, else its first function
+        names = [parsed[0] for node, parsed in nodes if parsed[0]] or [parsed[1] for node, parsed in nodes if parsed[1]]
+        profile.sites[profile.label] = names[0] if names else ""
+    return nodes
+
+def parse_node_texts(texts, carrier_map=None, label=None):
+    """Parse the text of one node after another; a picklable entry point for pool workers.
+
+    With a ``label`` the parse is profiled and ``(parsed list, profile)`` is returned.
+    """
+    profile = None if label is None else Profile(label)
+    parsed = [parse_node(text.split("\n"), carrier_map, profile) for text in texts]
+    return parsed if profile is None else (parsed, profile)
+
+def parse_node(lines, carrier_map=None, profile=None):
+    """Parse the lines of a single node into ``(site, function, data_lte, data_nr)``."""
+    state = ParseState()
+
+    # Single pass over the log: the section recogniser hands every row of a
+    # table we read to its handler. Power and RRU are only known once their
+    # tables (which come later in the log) have been read, so they are filled
+    # in afterwards.
+    if profile is None:
+        for handler, row in iter_table_rows(lines):
+            handler(state, row)
+    else:
+        run_handlers_profiled(state, lines, profile)
+
+    site = state.site
+    function = state.function
+    data_lte = state.data_lte
+    data_nr = state.data_nr
+
+    # Fill in the columns that depend on tables read later in the log
+    with timed(profile, "join") as counters:
+        fill_late_columns(state, carrier_map)
+        counters["rows"] = len(data_lte) + len(data_nr)
+
+    # Pack the rows into columns; values shared by every row of the log (the
+    # operator constants, SITE and the NR function) are stored once
+    with timed(profile, "RowTable build") as counters:
+        data_lte = RowTable.from_dicts(data_lte, HEADERS_LTE, dict(CONSTANTS_LTE, SITE=site))
+        data_nr = RowTable.from_dicts(data_nr, HEADERS_NR, dict(CONSTANTS_NR, MECONTEXT=function, FUNCTION=function))
+        counters["rows"] = len(data_lte) + len(data_nr)
+    return site, function, data_lte, data_nr
+
+def fill_late_columns(state, carrier_map=None):
+    """Fill in LTE power, SECTOR, RRU and RF columns and join the NR carriers."""
+    site = state.site
+    data_lte = state.data_lte
+    data_nr = state.data_nr
+    power_data = state.power_data
+    rf_table = state.rf_table
+
+    for item in data_lte:
+        power = power_data.get(item.get("CELL"), {})
+        item.update({
+            "CONFOUTPUTPOWER": power.get("CONFOUTPUTPOWER", ""),
+            "TXANTENNAS": power.get("TXANTENNAS", ""),
+            "RXANTENNAS": power.get("RXANTENNAS", ""),
+        })
+    data_lte.extend(state.data_nbiot)
+    for item in data_lte:
+        item["SECTOR"] = site + "S" + item.get("CELLID", "")
+        item["RRU"] = rf_table.rru(item.get("CELL"))
+        item.update(rf_table.cell_columns(item.get("CELL")))
+
+    for item in data_nr:
+        item["RRU"] = rf_table.rru(item.get("CELL"))
+        item.update(rf_table.cell_columns(item.get("CELL")))
+
+    for carrier in join_nr_carriers(data_nr, state.nr_carriers, carrier_map):
+        logger.warning("NRSectorCarrier=%s matched no single NRCellDU", carrier)
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from radiodata.sections import iter_table_rows
+
+# Counters kept per (log, section), in the order they are reported
+COUNTERS = ("seconds", "calls", "lines", "rows", "bytes")
+
+class Profile:
+    """Wall time, lines scanned, rows emitted and bytes per pipeline section.
+
+    Opt-in: the parser, batch runner and writers only measure anything when a
+    Profile is passed to them. Sections are recorded under ``label`` (the log
+    being processed); profiles from pool workers are combined with merge().
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.stats = {}  # (label, section) -> [seconds, calls, lines, rows, bytes]
+        self.sites = {}  # label -> site parsed from it
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add(self, section, seconds=0.0, calls=1, lines=0, rows=0, size=0, label=None):
+        key = (self.label if label is None else label, section)
+        with self._lock:
+            stats = self.stats.setdefault(key, [0.0, 0, 0, 0, 0])
+            stats[0] += seconds
+            stats[1] += calls
+            stats[2] += lines
+            stats[3] += rows
+            stats[4] += size
+
+    def merge(self, other):
+        for (label, section), (seconds, calls, lines, rows, size) in other.stats.items():
+            self.add(section, seconds, calls, lines, rows, size, label=label)
+        self.sites.update(other.sites)
+
+    def records(self):
+        """One dict per (log, section) with the COUNTERS."""
+        records = []
+        for (label, section), stats in self.stats.items():
+            record = {"log": label, "site": self.sites.get(label, ""), "section": section}
+            record.update(zip(COUNTERS, stats))
+            record["seconds"] = round(record["seconds"], 6)
+            records.append(record)
+        return records
+
+    def totals(self):
+        """The COUNTERS of every section summed over all logs."""
+        totals = {}
+        for (label, section), stats in self.stats.items():
+            total = totals.setdefault(section, [0.0, 0, 0, 0, 0])
+            for i, value in enumerate(stats):
+                total[i] += value
+        return totals
+
+    def format(self):
+        """Render totals() as a text table."""
+        lines = [f"{'section':24s} {'seconds':>10s} {'calls':>8s} {'lines':>10s} {'rows':>9s} {'bytes':>12s}"]
+        for section, (seconds, calls, line_count, rows, size) in self.totals().items():
+            lines.append(f"{section:24s} {seconds:10.4f} {calls:8d} {line_count:10d} {rows:9d} {size:12d}")
+        return "\n".join(lines)
+
+    def to_jsonl(self):
+        return "".join(json.dumps(record) + "\n" for record in self.records())
+
+    def write_jsonl(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_jsonl())
+
+@contextmanager
+def timed(profile, section):
+    """Time the block as ``section`` of ``profile`` (a no-op when it is None).
+
+    Yields a dict the block can fill with ``lines``, ``rows`` and ``bytes``.
+    """
+    counters = {}
+    if profile is None:
+        yield counters
+        return
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        profile.add(section, time.perf_counter() - start, lines=counters.get("lines", 0),
+                    rows=counters.get("rows", 0), size=counters.get("bytes", 0))
+
+class LineCounter:
+    """Iterate over lines, counting them and their characters."""
+
+    __slots__ = ("source", "lines", "chars")
+
+    def __init__(self, source):
+        self.source = source
+        self.lines = 0
+        self.chars = 0
+
+    def __iter__(self):
+        for line in self.source:
+            self.lines += 1
+            self.chars += len(line) + 1
+            yield line
+
+def run_handlers_profiled(state, lines, profile):
+    """Feed every table row to its handler like parse_txt_file, timing each section.
+
+    The lines scanned (and their characters) up to a row, and the time taken
+    to recognise and handle it, are charged to the section of its handler;
+    lines after the last table go to "scan".
+    """
+    counter = LineCounter(lines)
+    stats = {}
+    seen_lines = seen_chars = 0
+    perf_counter = time.perf_counter
+    last = perf_counter()
+    for handler, row in iter_table_rows(counter):
+        handler(state, row)
+        now = perf_counter()
+        section = stats.setdefault(handler.section, [0.0, 0, 0, 0])
+        section[0] += now - last
+        section[1] += counter.lines - seen_lines
+        section[2] += 1
+        section[3] += counter.chars - seen_chars
+        seen_lines, seen_chars = counter.lines, counter.chars
+        last = now
+    stats["scan"] = [perf_counter() - last, counter.lines - seen_lines, 0, counter.chars - seen_chars]
+    for name, (seconds, line_count, rows, size) in stats.items():
+        profile.add(name, seconds, lines=line_count, rows=rows, size=size)
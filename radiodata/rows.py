@@ -0,0 +1,131 @@
+from itertools import repeat
+
+class RowTable:
+    """Rows of one output sheet, held column by column.
+
+    A column whose value is the same on every row is kept once in ``constants``
+    instead of being repeated per row; every other column is a list in
+    ``columns``. Iterating yields row dicts for callers that want them, but the
+    writers and the DataFrame/Arrow conversions read the columns directly.
+    """
+
+    __slots__ = ("headers", "columns", "constants", "length")
+
+    def __init__(self, headers, constants=None):
+        self.headers = list(headers)
+        self.constants = dict(constants or {})
+        self.columns = {header: [] for header in self.headers if header not in self.constants}
+        self.length = 0
+
+    @classmethod
+    def from_dicts(cls, rows, headers, constants=None):
+        """Build a table from row dicts; ``constants`` override the rows' values."""
+        table = cls(headers, constants)
+        columns = table.columns.items()
+        for row in rows:
+            get = row.get
+            for header, column in columns:
+                column.append(get(header))
+            table.length += 1
+        table.fold_constants()
+        return table
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        headers = self.headers
+        for values in self.iter_values():
+            yield dict(zip(headers, values))
+
+    def __repr__(self):
+        return f"RowTable({self.length} rows, {len(self.columns)} columns, {len(self.constants)} constants)"
+
+    def append(self, row):
+        """Append one row dict; a constant it gives another value becomes a column."""
+        get = row.get
+        for header, value in list(self.constants.items()):
+            if get(header) != value:
+                self.columns[header] = [self.constants.pop(header)] * self.length
+        for header, column in self.columns.items():
+            column.append(get(header))
+        self.length += 1
+
+    def fold_constants(self):
+        """Move columns holding a single value on every row into ``constants``."""
+        if not self.length:
+            return
+        for header, column in list(self.columns.items()):
+            first = column[0]
+            if column.count(first) == self.length:
+                self.constants[header] = first
+                del self.columns[header]
+
+    def column(self, header):
+        """Values of one column as a list (constants are expanded)."""
+        if header in self.columns:
+            return self.columns[header]
+        return [self.constants.get(header)] * self.length
+
+    def iter_values(self, headers=None):
+        """Yield each row as a tuple of values in ``headers`` order (None for missing columns)."""
+        columns = []
+        for header in headers or self.headers:
+            if header in self.columns:
+                columns.append(self.columns[header])
+            else:
+                columns.append(repeat(self.constants.get(header), self.length))
+        return zip(*columns)
+
+    def extend(self, other):
+        """Append the rows of another table; constants that differ become columns."""
+        if not other.length:
+            return
+        if not self.length:
+            self.constants = dict(other.constants)
+            self.columns = {header: list(column) for header, column in other.columns.items()}
+            self.length = other.length
+            return
+        for header in self.headers:
+            if header in self.constants:
+                value = self.constants[header]
+                if header not in other.columns and other.constants.get(header) == value:
+                    continue
+                self.columns[header] = [self.constants.pop(header)] * self.length
+            self.columns[header].extend(other.column(header))
+        self.length += other.length
+
+    @classmethod
+    def from_pandas(cls, frame, headers=None):
+        """Build a table from the columns of a DataFrame (NaN becomes None)."""
+        table = cls(headers if headers is not None else list(frame.columns))
+        for header in table.headers:
+            column = frame[header].astype(object)
+            table.columns[header] = column.where(column.notna(), None).tolist()
+        table.length = len(frame)
+        return table
+
+    def to_pandas(self, headers=None):
+        """Build a DataFrame straight from the columns."""
+        import pandas as pd
+
+        headers = headers or self.headers
+        data = {header: self.columns.get(header, self.constants.get(header)) for header in headers}
+        return pd.DataFrame(data, index=pd.RangeIndex(self.length), columns=headers)
+
+    def to_arrow(self, headers=None):
+        """Build a pyarrow Table of string columns straight from the columns."""
+        import pyarrow as pa
+
+        headers = headers or self.headers
+        arrays = []
+        for header in headers:
+            if header in self.columns:
+                arrays.append(pa.array(self.columns[header], pa.string()))
+            else:
+                value = self.constants.get(header)
+                if value is None:
+                    arrays.append(pa.nulls(self.length, pa.string()))
+                else:
+                    arrays.append(pa.repeat(pa.scalar(value, pa.string()), self.length))
+        return pa.Table.from_arrays(arrays, names=list(headers))
@@ -0,0 +1,150 @@
+import re
+from typing import NamedTuple, Optional
+
+# Cell tokens in the Sector/AntennaGroup/Cells column, e.g. "FDD=WXLC68A"
+CELL_TOKEN_RE = re.compile(r"\b(SE|AG|FDD|TDD|NRC|NIOT|GT)=(\S+)")
+# "(State:CellIds:PCIs)" list at the end of the column, e.g. "(1:1:337, 1:101:337)"
+CELL_STATES_RE = re.compile(r"\(([^()]*)\)\s*$")
+# "value (value)" fields: TX (W/dBm) and VSWR (RL)
+VALUE_PAIR_RE = re.compile(r"^\s*(-?[\d.]+)\s*(?:\((-?[\d.]+)\))?")
+
+# RF columns added to the LTE/NR rows, with the branch value each one reports
+RF_COLUMNS = {
+    "RF_TX_DBM": "tx_dbm",
+    "RF_VSWR": "vswr",
+    "RF_RX_DBM": "rx_dbm",
+}
+
+class RfValue(float):
+    """A number read from the RF table that prints as it was written (``1.60`` stays ``1.60``)."""
+
+    __slots__ = ("text",)
+
+    def __new__(cls, text):
+        value = super().__new__(cls, text)
+        value.text = text
+        return value
+
+    def __str__(self):
+        return self.text
+
+class RfCell(NamedTuple):
+    kind: str  # FDD, TDD, NRC, NIOT or GT
+    name: str
+    state: Optional[str]
+    cell_id: Optional[str]
+    pci: Optional[str]
+
+class RfBranch(NamedTuple):
+    branch: str
+    tx_w: Optional[float]
+    tx_dbm: Optional[float]
+    vswr: Optional[float]
+    return_loss: Optional[float]
+    rx_dbm: Optional[float]
+
+class RfUnit:
+    """One radio unit (FRU) of the sdir RF table with its branches and cells."""
+
+    __slots__ = ("fru", "lnh", "board", "sector", "antenna_group", "cells", "branches")
+
+    def __init__(self, fru, lnh, board, sector, antenna_group, cells):
+        self.fru = fru
+        self.lnh = lnh
+        self.board = board
+        self.sector = sector
+        self.antenna_group = antenna_group
+        self.cells = cells
+        self.branches = []
+
+    def __repr__(self):
+        return f"RfUnit({self.fru!r}, board={self.board!r}, cells={[cell.name for cell in self.cells]!r})"
+
+    def worst(self, field):
+        """Highest value of ``field`` over the branches, None when no branch reports it."""
+        values = [getattr(branch, field) for branch in self.branches if getattr(branch, field) is not None]
+        return max(values) if values else None
+
+def parse_pair(text):
+    """Split ``"4.6 (36.6)"`` into ``(4.6, 36.6)``; missing values are None."""
+    match = VALUE_PAIR_RE.match(text)
+    if match is None:
+        return None, None
+    first, second = match.groups()
+    return RfValue(first), RfValue(second) if second is not None else None
+
+def parse_float(text):
+    text = text.strip()
+    try:
+        return RfValue(text)
+    except ValueError:
+        return None
+
+def parse_cells(text):
+    """Parse the Sector/AntennaGroup/Cells column into ``(sector, antenna group, cells)``."""
+    sector = antenna_group = ""
+    names = []
+    for kind, name in CELL_TOKEN_RE.findall(text):
+        if kind == "SE":
+            sector = name
+        elif kind == "AG":
+            antenna_group = name
+        else:
+            names.append((kind, name))
+
+    states = []
+    match = CELL_STATES_RE.search(text)
+    if match is not None:
+        states = [item.strip().split(":") for item in match.group(1).split(",")]
+
+    cells = []
+    for i, (kind, name) in enumerate(names):
+        fields = states[i] if i < len(states) else []
+        if len(fields) == 3:
+            cells.append(RfCell(kind, name, fields[0], fields[1], fields[2]))
+        else:
+            cells.append(RfCell(kind, name, fields[0] if fields else None, None, None))
+    return sector, antenna_group, tuple(cells)
+
+class RfTable:
+    """The sdir RF table of a log, indexed by FRU and by cell name."""
+
+    def __init__(self):
+        self.units = {}  # (FRU, cell column) -> RfUnit
+        self.by_cell = {}  # cell name -> RfUnit
+
+    def __len__(self):
+        return len(self.units)
+
+    def add_row(self, parts):
+        """Add one split row (``FRU;LNH;BOARD;RF;BP;TX;VSWR;RX;UEs;Cells``) of the RF table."""
+        fru = parts[0].strip()
+        # FRU names repeat across the nodes of a multi-node log, so a unit is
+        # keyed by its FRU together with its cell list
+        key = (fru, parts[9])
+        unit = self.units.get(key)
+        if unit is None:
+            # The cell list repeats on every branch row of an FRU; parse it once
+            sector, antenna_group, cells = parse_cells(parts[9])
+            unit = RfUnit(fru, parts[1].strip(), parts[2].strip(), sector, antenna_group, cells)
+            self.units[key] = unit
+            for cell in cells:
+                self.by_cell[cell.name] = unit
+
+        tx_w, tx_dbm = parse_pair(parts[5])
+        vswr, return_loss = parse_pair(parts[6])
+        unit.branches.append(RfBranch(parts[3].strip(), tx_w, tx_dbm, vswr, return_loss, parse_float(parts[7])))
+
+    def rru(self, cell, default="Unknown"):
+        """Board of the radio unit serving ``cell``."""
+        unit = self.by_cell.get(cell)
+        return unit.board if unit is not None else default
+
+    def cell_columns(self, cell):
+        """RF_COLUMNS values for ``cell``: the highest value over its RRU's branches, as written in the log."""
+        unit = self.by_cell.get(cell)
+        columns = {}
+        for column, field in RF_COLUMNS.items():
+            value = unit.worst(field) if unit is not None else None
+            columns[column] = str(value) if value is not None else ""
+        return columns
@@ -0,0 +1,119 @@
+import operator
+import re
+
+# One pattern recognises every line that changes the recogniser state: the
+# moshell prompt opening a command block ("OFFLINE_X_K> hgetc ..." / "X> sdir"),
+# the "MO ;attr1;attr2..." header of an hgetc table and the header of the sdir
+# RF table. Whitespace around the separators is not significant. The prompt
+# itself ("OFFLINE_X_K") names the node the commands run on.
+SECTION_RE = re.compile(
+    r"(?P<prompt>(?P<node>[^\s;>]+)>\s+(?P<command>\S+).*)"
+    r"|(?P<header>MO\s*;.*)"
+    r"|(?P<rf>FRU\s*;.*Sector/AntennaGroup/Cells.*)"
+)
+
+# Lines that can match SECTION_RE start with one of these or contain the prompt's
+# ">"; checking that first keeps the regex off the bulk of the data rows
+SECTION_PREFIXES = ("MO", "FRU")
+
+# Pseudo MO class the sdir RF table handler is registered under
+RF_TABLE = "sdir:RF"
+
+# MO class -> (fields, handler); filled in by @table_handler
+TABLE_HANDLERS = {}
+
+def table_handler(mo_class, fields=None, section=None):
+    """Register a function handling the rows of the ``mo_class`` hgetc table.
+
+    ``fields`` maps output columns to the attributes they are read from; the
+    handler is then called with a dict of those columns for every row. The
+    RF_TABLE handler takes no fields and gets the split row instead.
+    ``section`` names the handler in profiles (default: ``mo_class``).
+    """
+    def register(handler):
+        handler.section = section or mo_class
+        TABLE_HANDLERS[mo_class] = (fields, handler)
+        return handler
+    return register
+
+def mo_class(mo):
+    """Return the class of the last RDN in an MO column, e.g. ``EUtranCellFDD``."""
+    return mo.rsplit(",", 1)[-1].split("=", 1)[0].strip()
+
+def compile_projection(header, fields):
+    """Resolve output columns against an ``MO ;attr1;attr2...`` header row.
+
+    Returns ``(names, getter, width)``: the output columns present in the header,
+    an itemgetter pulling their values out of a split data row in that order, and
+    the number of fields a row needs. Attribute names are matched case-insensitively.
+    """
+    columns = [column.strip().lower() for column in header.split(";")]
+    names = []
+    positions = []
+    for name, attribute in fields.items():
+        attribute = attribute.lower()
+        if attribute in columns:
+            names.append(name)
+            positions.append(columns.index(attribute))
+    if not positions:
+        return (), None, 0
+    getter = operator.itemgetter(*positions)
+    if len(positions) == 1:
+        getter = lambda parts, get=getter: (get(parts),)
+    return tuple(names), getter, max(positions) + 1
+
+def iter_table_rows(lines, handlers=TABLE_HANDLERS):
+    """Split a log into command blocks and tables and yield ``(handler, row)`` pairs.
+
+    Only tables whose MO class (taken from the first row after the header) has a
+    registered handler are split into fields; the rows of every other table, and
+    everything in an sdir block outside the RF table, are skipped untouched.
+    """
+    match_section = SECTION_RE.match
+    command = None  # Command of the current prompt block
+    header = None  # Header row waiting for its first data row
+    reading = False  # Whether rows go to the handler below
+    handler = names = getter = marker = None
+    width = 0
+    for line in lines:
+        if line.startswith(SECTION_PREFIXES) or ">" in line:
+            match = match_section(line)
+        else:
+            match = None
+        if match is not None:
+            kind = match.lastgroup
+            header = None
+            reading = False
+            if kind == "prompt":
+                command = match.group("command").lower()
+            elif kind == "header":
+                header = line
+            elif command in (None, "sdir") and RF_TABLE in handlers:
+                handler, names, getter, width, marker = handlers[RF_TABLE][1], None, None, 10, ""
+                reading = True
+            continue
+
+        if not line or line.isspace():
+            header = None
+            reading = False
+            continue
+
+        if header is not None:
+            cls = mo_class(line.split(";", 1)[0])
+            if cls in handlers:
+                fields, handler = handlers[cls]
+                names, getter, width = compile_projection(header, fields)
+                marker = cls + "="
+                reading = True
+            header = None
+
+        if not reading:
+            continue
+
+        parts = line.split(";")
+        if len(parts) < width or marker not in parts[0]:
+            continue
+        if names is None:
+            yield handler, parts
+        else:
+            yield handler, dict(zip(names, [value.strip() for value in getter(parts)]))
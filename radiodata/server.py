@@ -0,0 +1,445 @@
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email.message import Message
+from io import BytesIO
+
+import tornado.web
+from tornado import httputil
+
+from radiodata.batch import is_large_log
+from radiodata.export import ZIP_LEVEL, generate_batch_zip, generate_zip_download
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.parser import group_nodes, load_carrier_map, parse_nodes
+from radiodata.rows import RowTable
+from radiodata.validate import FINDINGS_HEADERS, validate
+from radiodata.writers import FORMATS, write_rows
+
+logger = logging.getLogger(__name__)
+
+# Requests admitted at once (running or waiting for a worker); more get a 503
+MAX_QUEUE = int(os.environ.get("RADIODATA_MAX_QUEUE", "32"))
+
+# Largest request body accepted, in MB
+MAX_BODY_MB = int(os.environ.get("RADIODATA_MAX_BODY_MB", "512"))
+
+# Longest header block of a multipart part, in bytes
+MAX_PART_HEADERS = 64 * 1024
+
+# Bytes of a response body handed to the connection at a time
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Seconds a rejected client is asked to wait before retrying
+RETRY_AFTER = 5
+
+# Latencies of the last requests kept for the /health percentiles
+LATENCY_WINDOW = 1000
+
+# Response content type of each output format, and of the ZIP
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "zip": "application/zip",
+}
+
+# ?table= value -> (headers, sheet) of a single merged table returned instead of a ZIP
+TABLES = {
+    "lte": (HEADERS_LTE, "LTE"),
+    "nr": (HEADERS_NR, "NR"),
+    "findings": (FINDINGS_HEADERS, "Findings"),
+}
+
+class Service:
+    """The parser pool shared by all requests, with admission control and metrics.
+
+    At most ``max_queue`` requests are admitted at once; of those, ``concurrency``
+    are processed while the rest wait their turn, which is the queue depth
+    reported by /health. Requests arriving when the queue is full are rejected
+    before their body is read, so clients back off instead of piling up uploads.
+    """
+
+    def __init__(self, workers=None, max_queue=MAX_QUEUE, concurrency=None, carrier_map=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.max_queue = max_queue
+        self.carrier_map = carrier_map
+        self.concurrency = concurrency or self.workers
+        self.slots = asyncio.Semaphore(self.concurrency)
+        self.admitted = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.logs_parsed = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.time()
+
+    def admit(self):
+        if self.admitted >= self.max_queue:
+            self.rejected += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self, seconds, ok):
+        self.admitted -= 1
+        if ok:
+            self.completed += 1
+            self.latencies.append(seconds)
+        else:
+            self.failed += 1
+
+    async def parse(self, paths):
+        """Parse logs on the pool; returns ``(nodes or exception)`` per path, in order.
+
+        A large log (see is_large_log) is split on a thread of this process
+        instead, and its nodes parsed across the pool.
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for path in paths:
+            if is_large_log(path):
+                futures.append(loop.run_in_executor(None, parse_nodes, path, self.carrier_map, None, self.executor))
+            else:
+                futures.append(loop.run_in_executor(self.executor, parse_nodes, path, self.carrier_map))
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queue_depth": self.admitted - self.active,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "logs_parsed": self.logs_parsed,
+            "latency_seconds": {
+                "count": len(latencies),
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+            },
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+def percentile(values, percent):
+    """Nearest-rank percentile of sorted ``values`` (None when empty)."""
+    if not values:
+        return None
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return round(values[int(index)], 4)
+
+def header_param(name, value, param):
+    """Return a parameter of a MIME header value, e.g. the boundary of a Content-Type."""
+    message = Message()
+    message[name] = value
+    return message.get_param(param, header=name)
+
+class MultipartSpooler:
+    """Split a ``multipart/form-data`` body into one file per uploaded part as it arrives.
+
+    Only the current chunk and a delimiter's worth of bytes are held in memory.
+    Parts without a file name (plain form fields) are skipped. ``logs`` lists
+    the ``(file name, path)`` of the parts written to ``directory``.
+    """
+
+    def __init__(self, boundary, directory):
+        self.delimiter = b"\r\n--" + boundary.encode("latin-1")
+        self.directory = directory
+        self.buffer = b"\r\n"  # So the first delimiter matches like the others
+        self.state = "preamble"  # preamble, delimiter, headers, body or done
+        self.file = None
+        self.logs = []
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        while self.state != "done":
+            if self.state in ("preamble", "body"):
+                index = self.buffer.find(self.delimiter)
+                if index < 0:
+                    # Keep what could be the start of a delimiter split across chunks
+                    keep = len(self.delimiter)
+                    if self.file is not None and len(self.buffer) > keep:
+                        self.file.write(self.buffer[:-keep])
+                    self.buffer = self.buffer[-keep:]
+                    return
+                if self.file is not None:
+                    self.file.write(self.buffer[:index])
+                    self.file.close()
+                    self.file = None
+                self.buffer = self.buffer[index + len(self.delimiter):]
+                self.state = "delimiter"
+            elif self.state == "delimiter":
+                if len(self.buffer) < 2:
+                    return
+                if self.buffer.startswith(b"--"):
+                    self.state = "done"
+                    self.buffer = b""
+                    return
+                end = self.buffer.find(b"\r\n")
+                if end < 0:
+                    return
+                self.buffer = self.buffer[end + 2:]
+                self.state = "headers"
+            else:
+                end = self.buffer.find(b"\r\n\r\n")
+                if end < 0:
+                    if len(self.buffer) > MAX_PART_HEADERS:
+                        raise ValueError("multipart part headers too long")
+                    return
+                headers = httputil.HTTPHeaders.parse(self.buffer[:end].decode("utf-8", "replace"))
+                self.buffer = self.buffer[end + 4:]
+                disposition = headers.get("Content-Disposition", "")
+                filename = header_param("Content-Disposition", disposition, "filename") if disposition else None
+                if filename is not None:
+                    path = os.path.join(self.directory, f"{len(self.logs)}.txt")
+                    self.file = open(path, "wb")
+                    self.logs.append((os.path.basename(filename) or os.path.basename(path), path))
+                self.state = "body"
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        """Close the last part; raises ValueError if the body ended before its closing delimiter."""
+        self.close()
+        if self.state != "done":
+            raise ValueError("multipart body ends before its closing delimiter")
+
+def build_output(parsed, fmt, findings, table=None):
+    """Render the per-site tuples of the parsed logs (see group_nodes) as ``(buffer, file name, media type)``.
+
+    One site gives the per-site ZIP of generate_zip_download, several the
+    batch ZIP of generate_batch_zip. With ``table`` the merged rows of that
+    table (see TABLES) are returned as a single file of format ``fmt``.
+    """
+    if table is None:
+        if len(parsed) == 1:
+            zip_buffer, zip_filename = generate_zip_download(*parsed[0], fmt, findings, ZIP_LEVEL)
+        else:
+            zip_buffer, zip_filename = generate_batch_zip(parsed, fmt, findings, ZIP_LEVEL)
+        return zip_buffer, zip_filename, MEDIA_TYPES["zip"]
+
+    data_lte = RowTable(HEADERS_LTE)
+    data_nr = RowTable(HEADERS_NR)
+    for site, function, parsed_lte, parsed_nr in parsed:
+        data_lte.extend(parsed_lte)
+        data_nr.extend(parsed_nr)
+    rows = {"lte": data_lte, "nr": data_nr}.get(table)
+    if rows is None:
+        rows = validate(data_lte, data_nr)
+    headers, sheet_name = TABLES[table]
+    buffer = BytesIO()
+    write_rows(rows, headers, buffer, fmt, sheet_name=sheet_name)
+    buffer.seek(0)
+    date_str = datetime.now().strftime("%Y%m%d")
+    return buffer, f"RadioData_{sheet_name}_{date_str}.{FORMATS[fmt]}", MEDIA_TYPES[fmt]
+
+@tornado.web.stream_request_body
+class ParseHandler(tornado.web.RequestHandler):
+    """``POST /parse``: parse the uploaded logs and return their outputs.
+
+    The body is either ``multipart/form-data`` with one file part per log or a
+    single log sent as is (its name from ``?name=``). Either way it is streamed
+    to a temporary directory as it arrives, one file per log, rather than held
+    in memory. Query options:
+    ``format`` (xlsx, csv or parquet), ``findings=1`` to add the findings file
+    and ``table`` (lte, nr or findings) to get that merged table alone instead
+    of the ZIP. Logs that fail to parse or hold no LTE or NR cells are listed
+    in ``X-Radiodata-Failed``; if all of them do, the response is a 422 with
+    the errors as JSON.
+    """
+
+    def initialize(self, service):
+        self.service = service
+        self.admitted = False
+        self.ok = False
+        self.spool_dir = None
+        self.body_file = None
+        self.spooler = None
+
+    def prepare(self):
+        self.start = time.perf_counter()
+        if not self.service.admit():
+            self.set_status(503, reason="Queue full")
+            self.set_header("Retry-After", str(RETRY_AFTER))
+            self.finish({"error": "queue full", "queue_depth": self.service.admitted})
+            return
+        self.admitted = True
+        self.request.connection.set_max_body_size(MAX_BODY_MB * 1024 * 1024)
+        self.spool_dir = tempfile.mkdtemp(prefix="radiodata_")
+        content_type = self.request.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            boundary = header_param("Content-Type", content_type, "boundary")
+            if not boundary:
+                raise tornado.web.HTTPError(400, reason="Multipart body without a boundary")
+            self.spooler = MultipartSpooler(boundary, self.spool_dir)
+        else:
+            self.body_file = open(os.path.join(self.spool_dir, "body"), "wb")
+
+    def data_received(self, chunk):
+        if self.spooler is None:
+            self.body_file.write(chunk)
+            return
+        try:
+            self.spooler.feed(chunk)
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, reason=str(exc))
+
+    async def post(self):
+        if self.spooler is None:
+            self.body_file.close()
+        else:
+            try:
+                self.spooler.finish()
+            except ValueError as exc:
+                raise tornado.web.HTTPError(400, reason=str(exc))
+        fmt = self.get_query_argument("format", "xlsx")
+        table = self.get_query_argument("table", None)
+        findings = self.get_query_argument("findings", "0").lower() in ("1", "true", "yes")
+        if fmt not in FORMATS or (table is not None and table not in TABLES):
+            raise tornado.web.HTTPError(400, reason="Unknown format or table")
+
+        logs = self.spool_logs()
+        if not logs:
+            raise tornado.web.HTTPError(400, reason="No logs in the request")
+
+        service = self.service
+        async with service.slots:
+            service.active += 1
+            try:
+                outcomes = await service.parse([path for name, path in logs])
+                parsed = []
+                failures = []
+                for (name, path), outcome in zip(logs, outcomes):
+                    if isinstance(outcome, BaseException):
+                        failures.append((name, f"{type(outcome).__name__}: {outcome}"))
+                    elif not any(data_lte or data_nr for node, (site, function, data_lte, data_nr) in outcome):
+                        failures.append((name, "no LTE or NR cells found"))
+                    else:
+                        parsed.append(outcome)
+                service.logs_parsed += len(parsed)
+                if parsed:
+                    loop = asyncio.get_running_loop()
+                    sites = [site for nodes in parsed for site in group_nodes(nodes)]
+                    body, filename, media_type = await loop.run_in_executor(
+                        None, build_output, sites, fmt, findings, table)
+            finally:
+                service.active -= 1
+
+        for name, error in failures:
+            logger.warning("Failed to parse %s: %s", name, error)
+        if not parsed:
+            self.set_status(422)
+            self.write({"failures": [{"log": name, "error": error} for name, error in failures]})
+            return
+        self.set_header("Content-Type", media_type)
+        self.set_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.set_header("X-Radiodata-Logs", str(len(parsed)))
+        if failures:
+            self.set_header("X-Radiodata-Failed", ", ".join(name for name, error in failures))
+        self.ok = True
+        # The body goes out a slice at a time rather than copied whole
+        self.set_header("Content-Length", str(body.getbuffer().nbytes))
+        with body:
+            for chunk in iter(lambda: body.read(WRITE_CHUNK_SIZE), b""):
+                self.write(chunk)
+                await self.flush()
+
+    def spool_logs(self):
+        """Return ``(name, path)`` of every log in the spooled body."""
+        if self.spooler is not None:
+            return self.spooler.logs
+        body_path = self.body_file.name
+        if not os.path.getsize(body_path):
+            return []
+        return [(self.get_query_argument("name", "upload.txt"), body_path)]
+
+    def on_finish(self):
+        self.cleanup()
+
+    def on_connection_close(self):
+        self.cleanup()
+
+    def cleanup(self):
+        if self.body_file is not None and not self.body_file.closed:
+            self.body_file.close()
+        if self.spooler is not None:
+            self.spooler.close()
+        if self.spool_dir is not None:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+            self.spool_dir = None
+        if self.admitted:
+            self.admitted = False
+            self.service.release(time.perf_counter() - self.start, self.ok)
+
+class HealthHandler(tornado.web.RequestHandler):
+    """``GET /health``: queue depth, request counts and latency percentiles as JSON."""
+
+    def initialize(self, service):
+        self.service = service
+
+    def get(self):
+        self.write(self.service.metrics())
+
+def make_app(service):
+    return tornado.web.Application([
+        (r"/parse", ParseHandler, {"service": service}),
+        (r"/health", HealthHandler, {"service": service}),
+    ])
+
+async def serve(host, port, workers=None, max_queue=MAX_QUEUE, concurrency=None, carrier_map=None):
+    service = Service(workers, max_queue, concurrency, carrier_map)
+    server = make_app(service).listen(port, address=host, max_body_size=MAX_BODY_MB * 1024 * 1024)
+    logger.info("Serving on %s:%d with %d workers", host, port, service.workers)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        service.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the radiodata parser over HTTP (POST /parse, GET /health).")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8502, help="port to listen on (default: 8502)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of parser processes (default: number of CPUs)")
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE,
+                        help=f"requests admitted at once before new ones get a 503 (default: {MAX_QUEUE})")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="requests processed at once; the others wait in the queue (default: --workers)")
+    parser.add_argument("--carrier-map", metavar="CSV",
+                        help="carrier,cell CSV naming the NRCellDU of unlinked NRSectorCarriers")
+    args = parser.parse_args(argv)
+    try:
+        carrier_map = load_carrier_map(args.carrier_map) if args.carrier_map else None
+    except (OSError, ValueError) as exc:
+        parser.error(f"--carrier-map: {exc}")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_queue, args.concurrency, carrier_map))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from radiodata.batch import expand_inputs, run_batch
+from radiodata.cache import content_digest
+from radiodata.headers import HEADERS_LTE, HEADERS_NR
+from radiodata.parser import load_carrier_map, merge_nodes
+
+RRU_HEADERS = ["SITE", "TECH", "CELL", "RRU"]
+
+# Table -> columns; every table also carries the id of the log it came from
+STORE_TABLES = {
+    "lte": HEADERS_LTE,
+    "nr": HEADERS_NR,
+    "rru": RRU_HEADERS,
+}
+
+# Query option -> column it filters in each table (the NR rows name their site FUNCTION)
+QUERY_FILTERS = {
+    "cell": {"lte": "CELL", "nr": "CELL", "rru": "CELL"},
+    "site": {"lte": "SITE", "nr": "FUNCTION", "rru": "SITE"},
+    "pci": {"lte": "PCI", "nr": "PCI"},
+    "earfcn": {"lte": "CHANNEL_NO_DL", "nr": "CHANNEL_NO_DL"},
+    "tac": {"lte": "TAC", "nr": "TAC"},
+    "rru": {"lte": "RRU", "nr": "RRU", "rru": "RRU"},
+}
+
+def connect(path):
+    """Open (creating if needed) the store at ``path``."""
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "id INTEGER PRIMARY KEY, path TEXT UNIQUE, digest TEXT, site TEXT, function TEXT, ingested TEXT)"
+        )
+        for table, headers in STORE_TABLES.items():
+            columns = ", ".join(f'"{header}" TEXT' for header in headers)
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (source_id INTEGER, {columns})")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_source ON {table} (source_id)")
+            for column in sorted({filters[table] for filters in QUERY_FILTERS.values() if table in filters}):
+                connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_{column.lower()} ON {table} ("{column}")')
+    return connection
+
+def rru_rows(data_lte, data_nr):
+    """Yield the cell -> RRU mapping of one log as RRU_HEADERS tuples."""
+    for tech, site_column, rows in (("LTE", "SITE", data_lte), ("NR", "FUNCTION", data_nr)):
+        for site, cell, rru in rows.iter_values([site_column, "CELL", "RRU"]):
+            yield site, tech, cell, rru
+
+def ingest(connection, path, parsed, digest=None):
+    """Store the rows of one parsed log, replacing whatever an earlier ingest of ``path`` left."""
+    site, function, data_lte, data_nr = parsed
+    path = os.path.abspath(path)
+    with connection:
+        row = connection.execute("SELECT id FROM sources WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            for table in STORE_TABLES:
+                connection.execute(f"DELETE FROM {table} WHERE source_id = ?", row)
+            connection.execute("DELETE FROM sources WHERE id = ?", row)
+        source_id = connection.execute(
+            "INSERT INTO sources (path, digest, site, function, ingested) VALUES (?, ?, ?, ?, ?)",
+            (path, digest, site, function, datetime.now().isoformat(timespec="seconds")),
+        ).lastrowid
+        for table, rows in (("lte", data_lte.iter_values(HEADERS_LTE)), ("nr", data_nr.iter_values(HEADERS_NR)),
+                            ("rru", rru_rows(data_lte, data_nr))):
+            placeholders = ", ".join("?" * (len(STORE_TABLES[table]) + 1))
+            connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})",
+                                   ((source_id,) + tuple(values) for values in rows))
+    return source_id
+
+def ingest_results(path, results):
+    """Open the store at ``path`` and ingest a list of ``(log path, nodes)`` results (see run_batch)."""
+    connection = connect(path)
+    try:
+        for log_path, nodes in results:
+            with open(log_path, "rb") as file:
+                digest = content_digest(file)
+            ingest(connection, log_path, merge_nodes(nodes), digest)
+    finally:
+        connection.close()
+
+def query(connection, table="lte", columns=None, distinct=False, **filters):
+    """Return ``(headers, rows)`` of ``table`` matching every given filter (see QUERY_FILTERS)."""
+    headers = list(columns or STORE_TABLES[table])
+    unknown = [header for header in headers if header not in STORE_TABLES[table]]
+    if unknown:
+        raise ValueError(f"Unknown {table} column(s): {', '.join(unknown)}")
+    conditions = []
+    values = []
+    for name, value in filters.items():
+        if value is None:
+            continue
+        column = QUERY_FILTERS[name].get(table)
+        if column is None:
+            raise ValueError(f"The {table} table cannot be filtered by {name}")
+        conditions.append(f'"{column}" = ?')
+        values.append(str(value))
+    sql = "SELECT " + ("DISTINCT " if distinct else "") + ", ".join(f'"{header}"' for header in headers)
+    sql += f" FROM {table}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return headers, connection.execute(sql, values).fetchall()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store parsed radiodata rows and query them across sites.")
+    parser.add_argument("database", help="SQLite file of the store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="parse logs and add their rows to the store")
+    ingest_parser.add_argument("inputs", nargs="*", help="log files, directories of *.txt logs or glob patterns")
+    ingest_parser.add_argument("-l", "--list", dest="list_file", help="text file listing one log path per line")
+    ingest_parser.add_argument("-j", "--workers", type=int, default=None,
+                               help="number of parser processes (default: number of CPUs)")
+    ingest_parser.add_argument("--carrier-map", metavar="CSV",
+                               help="carrier,cell CSV naming the NRCellDU of unlinked NRSectorCarriers")
+
+    query_parser = commands.add_parser("query", help="print matching rows as CSV")
+    query_parser.add_argument("--table", choices=list(STORE_TABLES), default="lte", help="table to query (default: lte)")
+    for name in QUERY_FILTERS:
+        query_parser.add_argument(f"--{name}", help=f"only rows with this {name.upper()}")
+    query_parser.add_argument("--columns", help="comma separated columns to print (default: all)")
+    query_parser.add_argument("--distinct", action="store_true", help="drop duplicate result rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        paths = expand_inputs(args.inputs, args.list_file)
+        if not paths:
+            parser.error("no input logs given")
+        try:
+            carrier_map = load_carrier_map(args.carrier_map) if args.carrier_map else None
+        except (OSError, ValueError) as exc:
+            parser.error(f"--carrier-map: {exc}")
+        results, failures = run_batch(paths, args.workers, carrier_map=carrier_map)
+        ingest_results(args.database, results)
+        print(f"Ingested {len(results)}/{len(paths)} logs into {args.database}")
+        for path, error in failures:
+            print(f"FAILED {path}: {error}", file=sys.stderr)
+        return 1 if failures else 0
+
+    connection = connect(args.database)
+    try:
+        filters = {name: getattr(args, name) for name in QUERY_FILTERS}
+        columns = args.columns.split(",") if args.columns else None
+        try:
+            headers, rows = query(connection, args.table, columns, args.distinct, **filters)
+        except ValueError as exc:
+            parser.error(str(exc))
+    finally:
+        connection.close()
+    writer = csv.writer(sys.stdout)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from radiodata.headers import CONSTANTS_NBIOT
+from radiodata.rows import RowTable
+
+FINDINGS_HEADERS = ["CHECK", "TECH", "SITE", "CELL", "CHANNEL_NO_DL", "PCI", "RACHROOTSEQUENCE", "DETAIL"]
+
+# Columns the checks read, as (LTE column, NR column)
+CHECK_COLUMNS = {
+    "SITE": ("SITE", "FUNCTION"),
+    "CELL": ("CELL", "CELL"),
+    "CHANNEL_NO_DL": ("CHANNEL_NO_DL", "CHANNEL_NO_DL"),
+    "PCI": ("PCI", "PCI"),
+    "PCIG": ("PCIG", None),
+    "PSCI": ("PSCI", None),
+    "RACHROOTSEQUENCE": ("RACHROOTSEQUENCE", "RACHROOTSEQUENCE"),
+    "CONFOUTPUTPOWER": ("CONFOUTPUTPOWER", "CONFOUTPUTPOWER"),
+    "RRU": ("RRU", "RRU"),
+}
+
+def cell_frame(data_lte, data_nr):
+    """One DataFrame of the LTE and NR cells with the CHECK_COLUMNS, tagged by TECH."""
+    import pandas as pd
+
+    frames = []
+    for tech, rows, position in (("LTE", data_lte, 0), ("NR", data_nr, 1)):
+        columns = {name: source[position] for name, source in CHECK_COLUMNS.items()}
+        frame = rows.to_pandas([source for source in columns.values() if source is not None])
+        frame = frame.rename(columns={source: name for name, source in columns.items() if source is not None})
+        for name, source in columns.items():
+            if source is None:
+                frame[name] = None
+        frame["TECH"] = tech
+        frames.append(frame)
+    frame = pd.concat(frames, ignore_index=True)
+    # The same log parsed twice must not make its cells collide with themselves
+    frame = frame.drop_duplicates(["TECH", "SITE", "CELL"], keep="last")
+    # Empty strings count as missing
+    return frame.replace("", None)
+
+def shared_values(frame, keys, check, label):
+    """Findings for every cell sharing the values of ``keys`` with another cell of the same TECH."""
+    subset = frame.dropna(subset=keys)
+    subset = subset[subset.duplicated(["TECH"] + keys, keep=False)]
+    if subset.empty:
+        return subset
+    counts = subset.groupby(["TECH"] + keys)["CELL"].transform("size")
+    detail = label + " " + subset[keys[-1]] + " shared by " + counts.astype(str) + " cells on carrier " + subset[keys[0]]
+    return subset.assign(CHECK=check, DETAIL=detail)
+
+def without_nbiot(frame):
+    """Drop the NB-IoT rows, whose carrier and root sequence are placeholders
+    shared by every NB-IoT cell (see CONSTANTS_NBIOT)."""
+    return frame[frame["CHANNEL_NO_DL"] != CONSTANTS_NBIOT["CHANNEL_NO_DL"]]
+
+def check_pci_collisions(frame):
+    return shared_values(without_nbiot(frame), ["CHANNEL_NO_DL", "PCI"], "pci_collision", "PCI")
+
+def check_rach_roots(frame):
+    return shared_values(without_nbiot(frame), ["CHANNEL_NO_DL", "RACHROOTSEQUENCE"], "rach_root_duplicate", "Root sequence")
+
+def check_pci_groups(frame):
+    import pandas as pd
+
+    pci = pd.to_numeric(frame["PCI"], errors="coerce")
+    group = pd.to_numeric(frame["PCIG"], errors="coerce")
+    sub = pd.to_numeric(frame["PSCI"], errors="coerce")
+    expected = 3 * group + sub
+    mismatch = frame[pci.notna() & expected.notna() & (pci != expected)]
+    detail = ("PCI " + mismatch["PCI"] + " != 3*" + mismatch["PCIG"] + "+" + mismatch["PSCI"])
+    return mismatch.assign(CHECK="pci_group_mismatch", DETAIL=detail)
+
+def check_missing(frame):
+    power = frame[frame["CONFOUTPUTPOWER"].isna()].assign(CHECK="missing_power", DETAIL="no configuredMaxTxPower")
+    rru = frame[frame["RRU"].isna() | (frame["RRU"] == "Unknown")].assign(CHECK="missing_rru", DETAIL="cell not found in sdir")
+    return [power, rru]
+
+def validate(data_lte, data_nr):
+    """Run every consistency check over parsed rows; returns a RowTable of FINDINGS_HEADERS.
+
+    ``data_lte``/``data_nr`` are the RowTables of one log or of a whole cluster
+    merged together; collisions are looked for across all of them. The checks
+    are pandas group-bys and masks over the whole frame, not per-row loops.
+    """
+    import pandas as pd
+
+    # Empty tables give float columns the string checks cannot run on
+    if not data_lte and not data_nr:
+        return RowTable(FINDINGS_HEADERS)
+    frame = cell_frame(data_lte, data_nr)
+    findings = [check_pci_collisions(frame), check_pci_groups(frame), check_rach_roots(frame)] + check_missing(frame)
+    findings = [finding for finding in findings if not finding.empty]
+    if not findings:
+        return RowTable(FINDINGS_HEADERS)
+    findings = pd.concat(findings, ignore_index=True).sort_values(["CHECK", "TECH", "CHANNEL_NO_DL", "PCI", "SITE", "CELL"], na_position="first", kind="stable")
+    return RowTable.from_pandas(findings, FINDINGS_HEADERS)
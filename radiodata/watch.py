@@ -0,0 +1,97 @@
+import importlib
+import os
+import shutil
+import sys
+import time
+
+from radiodata.batch import LazyPool
+from radiodata.export import save_sites_to_excel
+from radiodata.parser import group_nodes, merge_nodes, parse_nodes
+from radiodata.writers import warm_up
+
+# Seconds between two scans of the inbox
+POLL_SECONDS = 1.0
+
+# Directories inside the inbox that processed logs are moved to
+DONE_DIR = "done"
+FAILED_DIR = "failed"
+
+def scan_inbox(inbox):
+    """Map every ``*.txt`` log directly inside ``inbox`` to its ``(size, mtime)``."""
+    logs = {}
+    with os.scandir(inbox) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".txt"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            logs[entry.path] = (stat.st_size, stat.st_mtime_ns)
+    return logs
+
+def move_to(path, directory):
+    """Move ``path`` into ``directory``, numbering the name if it is taken; returns the new path."""
+    os.makedirs(directory, exist_ok=True)
+    stem, extension = os.path.splitext(os.path.basename(path))
+    target = os.path.join(directory, stem + extension)
+    count = 1
+    while os.path.exists(target):
+        count += 1
+        target = os.path.join(directory, f"{stem}_{count}{extension}")
+    shutil.move(path, target)
+    return target
+
+def process_log(path, output_dir=".", fmt="xlsx", findings=False, store=None, executor=None, carrier_map=None):
+    """Parse one log, write its per-site outputs and add it to ``store``; returns ``(parsed, outputs)``.
+
+    ``parsed`` is the log's nodes merged, as from parse_txt_file.
+    """
+    nodes = parse_nodes(path, carrier_map, executor=executor)
+    outputs = save_sites_to_excel(group_nodes(nodes), output_dir, fmt, findings)
+    if store:
+        from radiodata.store import ingest_results
+
+        ingest_results(store, [(path, nodes)])
+    return merge_nodes(nodes), outputs
+
+def watch_inbox(inbox, output_dir=".", fmt="xlsx", findings=False, store=None, workers=None, poll=POLL_SECONDS,
+                carrier_map=None):
+    """Process the logs dropped into ``inbox`` as they arrive, until interrupted.
+
+    Everything runs in this one long-lived process. The writer libraries are
+    imported up front, and the pool for multi-node logs is kept between logs,
+    so each log costs only its parse and write. A log is picked up once its
+    size and modification time are the same on two scans in a row, which
+    leaves files that are still being copied in alone. It is then moved to
+    ``inbox/done`` (``inbox/failed`` if it could not be processed), so it is
+    not processed twice, even after a restart.
+    """
+    warm_up(fmt)
+    if findings:
+        # The findings checks run on pandas
+        importlib.import_module("pandas")
+
+    seen = {}
+    with LazyPool(workers) as executor:
+        while True:
+            current = scan_inbox(inbox)
+            for path in sorted(current):
+                if seen.get(path) != current[path]:
+                    continue
+                name = os.path.basename(path)
+                start = time.perf_counter()
+                try:
+                    parsed, outputs = process_log(path, output_dir, fmt, findings, store, executor, carrier_map)
+                except Exception as exc:
+                    move_to(path, os.path.join(inbox, FAILED_DIR))
+                    print(f"FAILED {name}: {type(exc).__name__}: {exc}", file=sys.stderr, flush=True)
+                    continue
+                move_to(path, os.path.join(inbox, DONE_DIR))
+                site, function, data_lte, data_nr = parsed
+                print(f"{name}: {site or function} ({len(data_lte)} LTE, {len(data_nr)} NR rows) "
+                      f"in {time.perf_counter() - start:.3f}s -> {', '.join(outputs) or 'no outputs'}", flush=True)
+            seen = current
+            time.sleep(poll)
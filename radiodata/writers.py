@@ -0,0 +1,102 @@
+import csv
+import io
+
+# Output formats, mapped to the file extension they are written with
+FORMATS = {
+    "xlsx": "xlsx",
+    "csv": "csv",
+    "parquet": "parquet",
+}
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 65536
+
+def iter_values(rows, headers):
+    """Yield each row as a sequence of values in ``headers`` order (None for missing columns).
+
+    A RowTable is read column-wise; any other iterable is taken as row dicts.
+    """
+    if hasattr(rows, "iter_values"):
+        yield from rows.iter_values(headers)
+        return
+    for row in rows:
+        yield [row.get(header) for header in headers]
+
+def write_xlsx(rows, headers, target, sheet_name="Sheet1"):
+    """Stream rows into a write-only openpyxl workbook, so memory stays constant."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(headers)
+    for values in iter_values(rows, headers):
+        sheet.append(values)
+    workbook.save(target)
+
+def write_csv(rows, headers, target):
+    """Write rows as UTF-8 CSV to a path or a binary file object."""
+    if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+        with open(target, "w", encoding="utf-8", newline="") as file:
+            write_csv(rows, headers, file)
+        return
+    if not isinstance(target, io.TextIOBase):
+        text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+        try:
+            write_csv(rows, headers, text)
+        finally:
+            text.detach()
+        return
+
+    writer = csv.writer(target)
+    writer.writerow(headers)
+    writer.writerows(iter_values(rows, headers))
+    target.flush()
+
+def write_parquet(rows, headers, target):
+    """Write rows as a Parquet file of string columns, one row group per batch."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if hasattr(rows, "to_arrow"):
+        # Column-backed rows convert to Arrow without going through row tuples
+        pq.write_table(rows.to_arrow(headers), target, row_group_size=PARQUET_BATCH_ROWS)
+        return
+
+    schema = pa.schema([(header, pa.string()) for header in headers])
+
+    def flush(batch):
+        columns = [[values[i] for values in batch] for i in range(len(headers))]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    with pq.ParquetWriter(target, schema) as writer:
+        batch = []
+        for values in iter_values(rows, headers):
+            batch.append(values)
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+def write_rows(rows, headers, target, fmt="xlsx", sheet_name="Sheet1"):
+    """Write a RowTable or an iterable of row dicts in ``headers`` column order.
+
+    ``target`` is a path or a binary file object, ``fmt`` one of FORMATS. Rows are
+    consumed as they are produced, so a generator can be passed straight in.
+    """
+    if fmt == "xlsx":
+        write_xlsx(rows, headers, target, sheet_name)
+    elif fmt == "csv":
+        write_csv(rows, headers, target)
+    elif fmt == "parquet":
+        write_parquet(rows, headers, target)
+    else:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {', '.join(FORMATS)}")
+
+def warm_up(fmt):
+    """Write an empty table in ``fmt`` so the libraries its writer loads lazily are imported now.
+
+    Long-running callers do this once up front; the first real write then
+    costs no more than the next.
+    """
+    write_rows([], ["WARM_UP"], io.BytesIO(), fmt)
@@ -0,0 +1,40 @@
+import unittest
+
+from radiodata.parser import join_nr_carriers
+
+def carrier(name, channel):
+    return {"MO": f"NRSectorCarrier={name}", "CHANNEL_NO_DL": channel}
+
+class JoinNrCarriersTest(unittest.TestCase):
+    def test_reference_map_and_name(self):
+        cells = [
+            {"CELL": "A", "SECTORCARRIERREF": "GNBDUFunction=1,NRSectorCarrier=X1"},
+            {"CELL": "B"},
+            {"CELL": "C"},
+        ]
+        unmatched = join_nr_carriers(cells, [carrier("X1", "1"), carrier("X2", "2"), carrier("C", "3")], {"X2": "B"})
+        self.assertEqual(unmatched, [])
+        self.assertEqual([cell.get("CHANNEL_NO_DL") for cell in cells], ["1", "2", "3"])
+        self.assertNotIn("SECTORCARRIERREF", cells[0])
+
+    def test_suffix_goes_to_longest_prefix_only(self):
+        cells = [{"CELL": "WPVC68A"}, {"CELL": "WPVC68AB"}]
+        unmatched = join_nr_carriers(cells, [carrier("WPVC68A-1", "1"), carrier("WPVC68AB-1", "2")])
+        self.assertEqual(unmatched, [])
+        self.assertEqual([cell["CHANNEL_NO_DL"] for cell in cells], ["1", "2"])
+
+    def test_row_order_does_not_matter(self):
+        cells = [{"CELL": "WPVC68AB"}, {"CELL": "WPVC68A"}]
+        join_nr_carriers(cells, [carrier("WPVC68AB-1", "2"), carrier("WPVC68A-1", "1")])
+        self.assertEqual([cell["CHANNEL_NO_DL"] for cell in cells], ["2", "1"])
+
+    def test_ambiguous_carriers_are_reported(self):
+        cells = [{"CELL": "A"}, {"CELL": "B"}]
+        unmatched = join_nr_carriers(cells, [carrier("A-1", "1"), carrier("A-2", "2"), carrier("B", "3"),
+                                             carrier("B-1", "4"), carrier("Z-1", "5")])
+        self.assertEqual(unmatched, ["Z-1", "A-1", "A-2", "B-1"])
+        self.assertNotIn("CHANNEL_NO_DL", cells[0])
+        self.assertEqual(cells[1]["CHANNEL_NO_DL"], "3")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from radiodata.incremental import diff_cells, run_incremental
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The NRCellDU row of cell WPVC68A in log_MMBB.txt (PCI 483, rachRootSequence 80)
+NR_CELL_ROW = "NRCellDU=WPVC68A;211        ;WPVC68A   ;483  ;45304;80"
+
+class DiffCellsTest(unittest.TestCase):
+    OLD = {
+        "LTE:A": {"PCI": "1", "TAC": "7", "hash": "a", "site": "S1"},
+        "LTE:B": {"PCI": "2", "TAC": "7", "hash": "b", "site": "S1"},
+        "NR:C": {"PCI": "3", "TAC": "7", "hash": "c", "site": "F1"},
+    }
+
+    def test_added_removed_changed(self):
+        new = {
+            "LTE:A": {"PCI": "9", "TAC": "8", "hash": "a2", "site": "S1"},
+            "NR:C": {"PCI": "3", "TAC": "7", "hash": "c", "site": "F1"},
+            "NR:D": {"PCI": "4", "TAC": "7", "hash": "d", "site": "F1"},
+        }
+        self.assertEqual(diff_cells("fallback", self.OLD, new), [
+            {"SITE": "S1", "TECH": "LTE", "CELL": "A", "CHANGE": "changed", "FIELD": "PCI", "OLD": "1", "NEW": "9"},
+            {"SITE": "S1", "TECH": "LTE", "CELL": "A", "CHANGE": "changed", "FIELD": "TAC", "OLD": "7", "NEW": "8"},
+            {"SITE": "S1", "TECH": "LTE", "CELL": "B", "CHANGE": "removed"},
+            {"SITE": "F1", "TECH": "NR", "CELL": "D", "CHANGE": "added"},
+        ])
+
+    def test_other_column_changed(self):
+        new = dict(self.OLD, **{"LTE:B": {"PCI": "2", "TAC": "7", "hash": "b2", "site": "S1"}})
+        self.assertEqual(diff_cells("fallback", self.OLD, new),
+                         [{"SITE": "S1", "TECH": "LTE", "CELL": "B", "CHANGE": "changed", "FIELD": "*"}])
+
+    def test_site_falls_back(self):
+        new = {"LTE:E": {"PCI": "5", "hash": "e"}}
+        self.assertEqual(diff_cells("fallback", {}, new)[0]["SITE"], "fallback")
+
+class RunIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="radiodata_test_")
+        self.output_dir = os.path.join(self.directory, "out")
+        os.mkdir(self.output_dir)
+        self.log = os.path.join(self.directory, "log_MMBB.txt")
+        shutil.copy(os.path.join(ROOT, "log_MMBB.txt"), self.log)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_logs(self, findings=False):
+        return run_incremental([self.log], self.output_dir, "csv", workers=1, findings=findings)
+
+    def edit_log(self, old, new):
+        with open(self.log, encoding="utf-8") as file:
+            text = file.read()
+        self.assertIn(old, text)
+        with open(self.log, "w", encoding="utf-8") as file:
+            file.write(text.replace(old, new))
+
+    def delta_lines(self, summary):
+        with open(summary["delta_path"], encoding="utf-8") as file:
+            return [line.rstrip("\r\n") for line in file][1:]
+
+    def test_first_run_adds_every_cell(self):
+        summary = self.run_logs()
+        self.assertEqual(summary["parsed"], [self.log])
+        self.assertEqual({row["CHANGE"] for row in summary["delta"]}, {"added"})
+        self.assertEqual(len(summary["delta"]), 15)
+
+    def test_unchanged_log_is_skipped(self):
+        self.run_logs()
+        summary = self.run_logs()
+        self.assertEqual(summary["skipped"], [self.log])
+        self.assertEqual(summary["parsed"], [])
+        self.assertEqual(summary["delta"], [])
+        self.assertIsNone(summary["delta_path"])
+
+    def test_changed_pci(self):
+        self.run_logs()
+        self.edit_log(NR_CELL_ROW, NR_CELL_ROW.replace(";483  ;", ";999  ;"))
+        summary = self.run_logs()
+        self.assertEqual(self.delta_lines(summary), ["WXVC68,NR,WPVC68A,changed,PCI,483,999"])
+
+    def test_changed_other_column(self):
+        self.run_logs()
+        self.edit_log(NR_CELL_ROW, NR_CELL_ROW[:-2] + "81")
+        summary = self.run_logs()
+        self.assertEqual(self.delta_lines(summary), ["WXVC68,NR,WPVC68A,changed,*,,"])
+
+    def test_removed_cell(self):
+        self.run_logs()
+        with open(self.log, encoding="utf-8") as file:
+            lines = [line for line in file if not line.startswith(NR_CELL_ROW)]
+        with open(self.log, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+        summary = self.run_logs()
+        self.assertEqual(self.delta_lines(summary), ["WXVC68,NR,WPVC68A,removed,,,"])
+
+    def test_findings_rerun(self):
+        self.run_logs()
+        summary = self.run_logs(findings=True)
+        self.assertEqual(summary["parsed"], [self.log])
+        self.assertTrue(any("_Radiodata_Findings_" in name for name in os.listdir(self.output_dir)))
+        self.assertEqual(self.run_logs(findings=True)["skipped"], [self.log])
+
+if __name__ == "__main__":
+    unittest.main()
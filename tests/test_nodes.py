@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from radiodata import group_nodes, merge_nodes, parse_nodes, parse_txt_file, save_sites_to_excel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_LOGS = ("log_MMBB.txt", "Log_LTE_Only.txt", "log_NR_only.txt")
+
+def concatenated(*log_names):
+    """The sample logs one after another, like a mobatch dump of their nodes."""
+    data = b""
+    for log_name in log_names:
+        with open(os.path.join(ROOT, log_name), "rb") as file:
+            data += file.read().rstrip(b"\n") + b"\n"
+    return data
+
+class NodesTest(unittest.TestCase):
+    def test_every_node_is_its_own_site(self):
+        nodes = parse_nodes(BytesIO(concatenated(*SAMPLE_LOGS)))
+        sites = group_nodes(nodes)
+        self.assertEqual([(site, function) for site, function, data_lte, data_nr in sites],
+                         [("WXLC68", "WXVC68"), ("SXLV92", ""), ("SAV618", "SAV618")])
+        for (site, function, data_lte, data_nr), log_name in zip(sites, SAMPLE_LOGS):
+            alone = parse_txt_file(os.path.join(ROOT, log_name))
+            self.assertEqual(list(data_lte), list(alone[2]), log_name)
+            self.assertEqual(list(data_nr), list(alone[3]), log_name)
+
+    def test_merge_keeps_every_row(self):
+        nodes = parse_nodes(BytesIO(concatenated(*SAMPLE_LOGS)))
+        site, function, data_lte, data_nr = merge_nodes(nodes)
+        self.assertEqual((site, function), ("WXLC68", "WXVC68"))
+        self.assertEqual(len(data_lte), sum(len(parsed[2]) for node, parsed in nodes))
+        self.assertEqual(len(data_nr), sum(len(parsed[3]) for node, parsed in nodes))
+
+    def test_repeated_node_is_merged(self):
+        sites = group_nodes(parse_nodes(BytesIO(concatenated("Log_LTE_Only.txt", "Log_LTE_Only.txt"))))
+        self.assertEqual(len(sites), 1)
+        site, function, data_lte, data_nr = sites[0]
+        self.assertEqual(len(data_lte), 2 * len(parse_txt_file(os.path.join(ROOT, "Log_LTE_Only.txt"))[2]))
+
+    def test_outputs_per_site(self):
+        sites = group_nodes(parse_nodes(BytesIO(concatenated(*SAMPLE_LOGS))))
+        with tempfile.TemporaryDirectory() as output_dir:
+            written = save_sites_to_excel(sites, output_dir, "csv")
+            names = sorted(os.path.basename(path).rsplit("_", 1)[0] for path in written)
+        self.assertEqual(names, ["SAV618_Radiodata_NR", "SXLV92_Radiodata_LTE", "WXLC68_Radiodata_LTE",
+                                 "WXVC68_Radiodata_NR"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from radiodata.rows import RowTable
+
+HEADERS = ["SITE", "CELL", "PCI", "NOTE"]
+
+ROWS = [
+    {"SITE": "S1", "CELL": "A", "PCI": "1"},
+    {"SITE": "S1", "CELL": "B", "PCI": "2", "NOTE": "x"},
+]
+
+def table(rows=ROWS, constants=None):
+    return RowTable.from_dicts(rows, HEADERS, constants)
+
+class FromDictsTest(unittest.TestCase):
+    def test_single_values_are_folded(self):
+        rows = table()
+        self.assertEqual(rows.constants, {"SITE": "S1"})
+        self.assertEqual(set(rows.columns), {"CELL", "PCI", "NOTE"})
+        self.assertEqual(list(rows), [
+            {"SITE": "S1", "CELL": "A", "PCI": "1", "NOTE": None},
+            {"SITE": "S1", "CELL": "B", "PCI": "2", "NOTE": "x"},
+        ])
+
+    def test_constants_override_rows(self):
+        rows = table(constants={"SITE": "S9", "NOTE": "n"})
+        self.assertEqual(rows.column("SITE"), ["S9", "S9"])
+        self.assertEqual(rows.column("NOTE"), ["n", "n"])
+
+    def test_empty(self):
+        rows = table([])
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(list(rows), [])
+        self.assertEqual(rows.constants, {})
+
+class AppendTest(unittest.TestCase):
+    def test_matching_constant_stays_folded(self):
+        rows = table()
+        rows.append({"SITE": "S1", "CELL": "C", "PCI": "3"})
+        self.assertEqual(rows.constants, {"SITE": "S1"})
+        self.assertEqual(rows.column("CELL"), ["A", "B", "C"])
+
+    def test_differing_constant_is_unfolded(self):
+        rows = table()
+        rows.append({"SITE": "S2", "CELL": "C", "PCI": "3"})
+        self.assertNotIn("SITE", rows.constants)
+        self.assertEqual(rows.column("SITE"), ["S1", "S1", "S2"])
+        self.assertEqual(len(rows), 3)
+
+    def test_missing_value_unfolds_as_none(self):
+        rows = table()
+        rows.append({"CELL": "C"})
+        self.assertEqual(rows.column("SITE"), ["S1", "S1", None])
+
+class ExtendTest(unittest.TestCase):
+    def test_matching_constants_stay_folded(self):
+        rows = table()
+        rows.extend(table([{"SITE": "S1", "CELL": "C", "PCI": "3"}]))
+        self.assertEqual(rows.constants, {"SITE": "S1"})
+        self.assertEqual(rows.column("CELL"), ["A", "B", "C"])
+        self.assertEqual(rows.column("NOTE"), [None, "x", None])
+
+    def test_conflicting_constants_become_columns(self):
+        rows = table()
+        rows.extend(table([{"SITE": "S2", "CELL": "C", "PCI": "3", "NOTE": "x"}]))
+        self.assertEqual(rows.constants, {})
+        self.assertEqual(rows.column("SITE"), ["S1", "S1", "S2"])
+        self.assertEqual(rows.column("NOTE"), [None, "x", "x"])
+        self.assertEqual(len(rows), 3)
+
+    def test_into_empty_table_copies(self):
+        other = table()
+        rows = RowTable(HEADERS)
+        rows.extend(other)
+        rows.append({"SITE": "S2", "CELL": "C"})
+        self.assertEqual(other.column("SITE"), ["S1", "S1"])
+        self.assertEqual(len(other), 2)
+        self.assertEqual(rows.column("SITE"), ["S1", "S1", "S2"])
+
+    def test_empty_other_is_ignored(self):
+        rows = table()
+        rows.extend(RowTable(HEADERS))
+        self.assertEqual(list(rows), list(table()))
+
+class ConversionTest(unittest.TestCase):
+    def test_pandas_round_trip(self):
+        rows = table()
+        frame = rows.to_pandas()
+        self.assertEqual(list(frame.columns), HEADERS)
+        self.assertEqual(list(frame["SITE"]), ["S1", "S1"])
+        self.assertEqual(list(RowTable.from_pandas(frame)), list(rows))
+
+    def test_arrow_columns(self):
+        rows = table()
+        arrow = rows.to_arrow()
+        self.assertEqual(arrow.column_names, HEADERS)
+        self.assertEqual(arrow.to_pylist(), list(rows))
+
+    def test_arrow_null_constant(self):
+        rows = table(constants={"NOTE": None})
+        self.assertEqual(rows.to_arrow().column("NOTE").to_pylist(), [None, None])
+
+if __name__ == "__main__":
+    unittest.main()
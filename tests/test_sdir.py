@@ -0,0 +1,79 @@
+import unittest
+
+from radiodata.sdir import RfCell, RfTable, parse_cells, parse_pair
+
+def rf_row(fru, branch, tx, vswr, rx, cells, board="RRU2217B28B"):
+    """One RF table row split like the parser does (``FRU;LNH;BOARD;RF;BP;TX;VSWR;RX;UEs;Cells``)."""
+    return [f"{fru}  ", "BXP_11 ", f"{board} ", f" {branch}  ", "11  ", tx, vswr, rx, "0/5  ", cells]
+
+LTE_NR_CELLS = "SE=B28_S1 AG=B28_S1 FDD=WPLC68A NRC=WPVC68A (1:31:237, 1:211:483)"
+
+class ParseCellsTest(unittest.TestCase):
+    def test_cells_with_states(self):
+        self.assertEqual(parse_cells(LTE_NR_CELLS), ("B28_S1", "B28_S1", (
+            RfCell("FDD", "WPLC68A", "1", "31", "237"),
+            RfCell("NRC", "WPVC68A", "1", "211", "483"),
+        )))
+
+    def test_gsm_cells_with_short_states(self):
+        self.assertEqual(parse_cells("SE=B8_S1 AG=B8_S1 GT=WXBC68A/0 GT=WXBC68A/1 (1, 1)"), ("B8_S1", "B8_S1", (
+            RfCell("GT", "WXBC68A/0", "1", None, None),
+            RfCell("GT", "WXBC68A/1", "1", None, None),
+        )))
+
+    def test_fewer_states_than_cells(self):
+        sector, antenna_group, cells = parse_cells("SE=S1 FDD=A FDD=B NIOT=C (1:1:10)")
+        self.assertEqual((sector, antenna_group), ("S1", ""))
+        self.assertEqual(cells, (
+            RfCell("FDD", "A", "1", "1", "10"),
+            RfCell("FDD", "B", None, None, None),
+            RfCell("NIOT", "C", None, None, None),
+        ))
+
+    def test_no_cells(self):
+        self.assertEqual(parse_cells("  "), ("", "", ()))
+
+class ParsePairTest(unittest.TestCase):
+    def test_pairs(self):
+        self.assertEqual(parse_pair("4.6 (36.6)"), (4.6, 36.6))
+        self.assertEqual(parse_pair("-84.5"), (-84.5, None))
+        self.assertEqual(parse_pair("-"), (None, None))
+
+    def test_values_keep_their_text(self):
+        vswr, return_loss = parse_pair("1.60 (12.7)")
+        self.assertEqual((str(vswr), str(return_loss)), ("1.60", "12.7"))
+
+class RfTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = RfTable()
+        self.table.add_row(rf_row("RRU-B28_S1-1", "A", "1.5 (31.7)", "1.21 (20.4)", "-84.5", LTE_NR_CELLS))
+        self.table.add_row(rf_row("RRU-B28_S1-1", "B", "1.5 (31.7)", "1.60 (12.7)", "-83.8", LTE_NR_CELLS))
+        self.table.add_row(rf_row("RRU-B8_S1-1", "A", "19.4 (42.9)", "1.40 (15.6)", "   ",
+                                  "SE=B8_S1 AG=B8_S1 GT=WXBC68A/0 GT=WXBC68A/1 (1, 1)", "RRUS12B8"))
+        self.table.add_row(rf_row("RRU-B8_S1-1", "B", "-", "-", "   ",
+                                  "SE=B8_S1 AG=B8_S1 GT=WXBC68A/0 GT=WXBC68A/1 (1, 1)", "RRUS12B8"))
+
+    def test_units_and_boards(self):
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.rru("WPLC68A"), "RRU2217B28B")
+        self.assertEqual(self.table.rru("WXBC68A/1"), "RRUS12B8")
+        self.assertEqual(self.table.rru("missing"), "Unknown")
+
+    def test_worst_branch_values(self):
+        self.assertEqual(self.table.cell_columns("WPVC68A"),
+                         {"RF_TX_DBM": "31.7", "RF_VSWR": "1.60", "RF_RX_DBM": "-83.8"})
+
+    def test_missing_values(self):
+        self.assertEqual(self.table.cell_columns("WXBC68A/0"), {"RF_TX_DBM": "42.9", "RF_VSWR": "1.40", "RF_RX_DBM": ""})
+        self.assertEqual(self.table.cell_columns("missing"), {"RF_TX_DBM": "", "RF_VSWR": "", "RF_RX_DBM": ""})
+
+    def test_same_fru_on_another_node(self):
+        self.table.add_row(rf_row("RRU-B28_S1-1", "A", "2.0 (33.0)", "1.10 (25.0)", "-90.0",
+                                  "SE=B28_S1 AG=B28_S1 FDD=OTHERA (1:31:100)", "RRU2212B8"))
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.rru("OTHERA"), "RRU2212B8")
+        self.assertEqual(self.table.cell_columns("OTHERA")["RF_TX_DBM"], "33.0")
+        self.assertEqual(self.table.cell_columns("WPLC68A")["RF_VSWR"], "1.60")
+
+if __name__ == "__main__":
+    unittest.main()
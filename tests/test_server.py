@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+from tornado.testing import AsyncHTTPTestCase
+
+from radiodata.server import RETRY_AFTER, MultipartSpooler, Service, make_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOUNDARY = "radiodata-test-boundary"
+
+def multipart(parts, closed=True):
+    """A multipart/form-data body of ``(field, file name or None, data)`` parts."""
+    body = b"preamble to ignore\r\n"
+    for field, filename, data in parts:
+        disposition = f'form-data; name="{field}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + data + b"\r\n"
+    if closed:
+        body += f"--{BOUNDARY}--\r\n".encode()
+    return body
+
+def spool(body, chunk_size, directory):
+    spooler = MultipartSpooler(BOUNDARY, directory)
+    for start in range(0, len(body), chunk_size):
+        spooler.feed(body[start:start + chunk_size])
+    spooler.finish()
+    logs = []
+    for name, path in spooler.logs:
+        with open(path, "rb") as file:
+            logs.append((name, file.read()))
+    return logs
+
+class MultipartSpoolerTest(unittest.TestCase):
+    # Data that nearly contains the delimiter, to be split across chunks
+    FIRST = b"line one\r\n--radiodata-test-boundar\r\n-- not a delimiter\r\n"
+    SECOND = b"\r\nsecond log\r\n\r\n"
+
+    def test_delimiter_split_across_chunks(self):
+        body = multipart([("logs", "a.txt", self.FIRST), ("logs", "b.txt", self.SECOND)])
+        for chunk_size in (1, 2, 3, 7, len(BOUNDARY) + 3, 64, len(body)):
+            with self.subTest(chunk_size=chunk_size), tempfile.TemporaryDirectory() as directory:
+                self.assertEqual(spool(body, chunk_size, directory), [("a.txt", self.FIRST), ("b.txt", self.SECOND)])
+
+    def test_form_fields_are_skipped(self):
+        body = multipart([("format", None, b"csv"), ("logs", "dir/a.txt", self.FIRST), ("note", None, b"x")])
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(spool(body, 5, directory), [("a.txt", self.FIRST)])
+
+    def test_missing_closing_delimiter(self):
+        body = multipart([("logs", "a.txt", self.FIRST)], closed=False)
+        for chunk_size in (1, len(body)):
+            with self.subTest(chunk_size=chunk_size), tempfile.TemporaryDirectory() as directory:
+                with self.assertRaises(ValueError):
+                    spool(body, chunk_size, directory)
+
+class ServerTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.service = Service(workers=1)
+        return make_app(self.service)
+
+    def tearDown(self):
+        super().tearDown()
+        self.service.shutdown()
+
+    def post_log(self, body, query="format=csv", headers=None):
+        return self.fetch(f"/parse?{query}", method="POST", body=body, headers=headers)
+
+    def test_log_gives_zip(self):
+        with open(os.path.join(ROOT, "log_NR_only.txt"), "rb") as file:
+            response = self.post_log(file.read())
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/zip")
+        self.assertIn("SAV618_RadioData_", response.headers["Content-Disposition"])
+
+    def test_log_without_cells_is_rejected(self):
+        response = self.post_log(b"garbage")
+        self.assertEqual(response.code, 422)
+        self.assertEqual(json.loads(response.body)["failures"],
+                         [{"log": "upload.txt", "error": "no LTE or NR cells found"}])
+
+    def test_unclosed_multipart_is_rejected(self):
+        body = multipart([("logs", "a.txt", b"garbage")], closed=False)
+        response = self.post_log(body, headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"})
+        self.assertEqual(response.code, 400)
+
+class FullQueueTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.service = Service(workers=1, max_queue=0)
+        return make_app(self.service)
+
+    def tearDown(self):
+        super().tearDown()
+        self.service.shutdown()
+
+    def test_rejected_with_retry_after(self):
+        response = self.fetch("/parse", method="POST", body=b"garbage")
+        self.assertEqual(response.code, 503)
+        self.assertEqual(response.headers["Retry-After"], str(RETRY_AFTER))
+        self.assertEqual(json.loads(response.body)["error"], "queue full")
+        health = json.loads(self.fetch("/health").body)
+        self.assertEqual(health["rejected"], 1)
+
+if __name__ == "__main__":
+    unittest.main()